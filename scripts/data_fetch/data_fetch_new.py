@@ -12,70 +12,398 @@ import time
 import argparse
 import requests
 import random
+import shutil
+import heapq
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Set, Optional, Tuple, Any, Iterable, Iterator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
 from collections import defaultdict, Counter
 import logging
 from datetime import datetime
-import math
 import hashlib
+import sqlite3
+import threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 
-from urllib.parse import quote, urljoin
+from urllib.parse import quote_plus
+
+# Optional Parquet copies of the datasets (--format parquet); CSV stays the interchange format
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_KM = 6371.0
+
+# Shared read-only fallback for optional sub-dicts; never mutate
+_EMPTY_DICT: Dict[str, Any] = {}
+
+# POI tag dispatch tables: tag key -> tag value -> counter bucket.
+# Keys are checked in order and the first match wins, mirroring the Overpass query filters.
+POI_CATEGORIES_1KM = {
+    'amenity': {
+        'hospital': 'hospitals', 'clinic': 'hospitals', 'doctors': 'hospitals',
+        'pharmacy': 'pharmacies',
+        'bank': 'banks', 'atm': 'banks',
+        'restaurant': 'restaurants', 'cafe': 'restaurants', 'food_court': 'restaurants', 'fast_food': 'restaurants'
+    },
+    'shop': {'supermarket': 'shopping', 'mall': 'shopping', 'department_store': 'shopping'},
+    'leisure': {'park': 'parks', 'playground': 'parks', 'garden': 'parks'}
+}
+
+POI_CATEGORIES_2_5KM = {
+    'amenity': {
+        'fuel': 'fuel_stations',
+        'charging_station': 'ev_charging',
+        'cinema': 'entertainment', 'theatre': 'entertainment'
+    },
+    'public_transport': {'station': 'public_transport', 'stop_position': 'public_transport'},
+    'railway': {'station': 'public_transport'},
+    'aeroway': {'aerodrome': 'public_transport', 'terminal': 'public_transport'}
+}
+
+# POI count columns in scoring order: (output column, counter bucket)
+POI_COUNT_COLUMNS_1KM = (
+    ('hospitals_count_1km', 'hospitals'),
+    ('pharmacies_count_1km', 'pharmacies'),
+    ('banks_count_1km', 'banks'),
+    ('restaurants_count_1km', 'restaurants'),
+    ('shopping_count_1km', 'shopping'),
+    ('parks_count_1km', 'parks')
+)
+
+POI_COUNT_COLUMNS_2_5KM = (
+    ('fuel_stations_count_2_5km', 'fuel_stations'),
+    ('ev_charging_count_2_5km', 'ev_charging'),
+    ('entertainment_count_2_5km', 'entertainment'),
+    ('transport_hubs_count_2_5km', 'public_transport')
+)
+
+# The dispatch tables with buckets replaced by their position in the count columns, for np.bincount
+POI_CATEGORY_IDS_1KM = {
+    key: {value: [bucket for _, bucket in POI_COUNT_COLUMNS_1KM].index(bucket) for value, bucket in table.items()}
+    for key, table in POI_CATEGORIES_1KM.items()
+}
+POI_CATEGORY_IDS_2_5KM = {
+    key: {value: [bucket for _, bucket in POI_COUNT_COLUMNS_2_5KM].index(bucket) for value, bucket in table.items()}
+    for key, table in POI_CATEGORIES_2_5KM.items()
+}
+
+# Category scores: (score column, count column, ideal count), all out of 100
+POI_SCORE_COLUMNS = (
+    ('hospital_score', 'hospitals_count_1km', 5),
+    ('pharmacy_score', 'pharmacies_count_1km', 8),
+    ('bank_score', 'banks_count_1km', 10),
+    ('restaurant_score', 'restaurants_count_1km', 25),
+    ('shopping_score', 'shopping_count_1km', 8),
+    ('green_space_score', 'parks_count_1km', 5),
+    ('entertainment_score', 'entertainment_count_2_5km', 5)
+)
+
+# Places API boolean attributes copied as-is: (output column, source field)
+HOTEL_ATMOSPHERE_FIELDS = (
+    ('serves_vegetarian_food', 'servesVegetarianFood'),
+    ('serves_breakfast', 'servesBreakfast'),
+    ('serves_lunch', 'servesLunch'),
+    ('serves_dinner', 'servesDinner'),
+    ('serves_brunch', 'servesBrunch'),
+    ('serves_beer', 'servesBeer'),
+    ('serves_wine', 'servesWine'),
+    ('serves_cocktails', 'servesCocktails'),
+    ('allows_dogs', 'allowsDogs'),
+    ('good_for_children', 'goodForChildren'),
+    ('good_for_groups', 'goodForGroups'),
+    ('good_for_watching_sports', 'goodForWatchingSports'),
+    ('live_music', 'liveMusic'),
+    ('menu_for_children', 'menuForChildren'),
+    ('outdoor_seating', 'outdoorSeating'),
+    ('reservable', 'reservable'),
+    ('delivery', 'delivery'),
+    ('takeout', 'takeout'),
+    ('curbside_pickup', 'curbsidePickup'),
+    ('dine_in', 'dineIn'),
+    ('restroom', 'restroom')
+)
+
+# Output column -> field of the Places accessibilityOptions, paymentOptions and parkingOptions objects
+HOTEL_ACCESSIBILITY_FIELDS = (
+    ('wheelchair_accessible_entrance', 'wheelchairAccessibleEntrance'),
+    ('wheelchair_accessible_parking', 'wheelchairAccessibleParking')
+)
+HOTEL_PAYMENT_FIELDS = (
+    ('accepts_credit_cards', 'acceptsCreditCards'),
+    ('accepts_debit_cards', 'acceptsDebitCards'),
+    ('accepts_cash_only', 'acceptsCashOnly')
+)
+HOTEL_PARKING_FIELDS = (
+    ('parking_free', 'freeParkingLot'),
+    ('parking_paid', 'paidParking'),
+    ('parking_street', 'freeStreetParking'),
+    ('parking_garage', 'freeGarageParking'),
+    ('valet_parking', 'valetParking')
+)
+
+# Locality scores and POI counts added by Overpass enrichment, defaulting to 0
+HOTEL_LOCALITY_FIELDS = (
+    'walkability_score', 'shopping_score', 'restaurant_score', 'bank_score', 'green_space_score',
+    'hospital_score', 'pharmacy_score', 'entertainment_score', 'locality_score',
+    'hospitals_count_1km', 'pharmacies_count_1km', 'banks_count_1km', 'restaurants_count_1km',
+    'shopping_count_1km', 'parks_count_1km', 'fuel_stations_count_2_5km', 'ev_charging_count_2_5km',
+    'entertainment_count_2_5km', 'transport_hubs_count_2_5km'
+)
+
+# The same locality fields in locality dataset column order: POI counts, then scores
+LOCALITY_DATASET_FIELDS = (
+    'hospitals_count_1km', 'pharmacies_count_1km', 'shopping_count_1km', 'restaurants_count_1km',
+    'banks_count_1km', 'parks_count_1km', 'fuel_stations_count_2_5km', 'ev_charging_count_2_5km',
+    'entertainment_count_2_5km', 'transport_hubs_count_2_5km',
+    'walkability_score', 'shopping_score', 'restaurant_score', 'bank_score', 'green_space_score',
+    'hospital_score', 'pharmacy_score', 'entertainment_score', 'locality_score'
+)
+
+# Fields whose non-empty share is reported as field completeness
+REPORT_COMPLETENESS_FIELDS = ('rating', 'user_rating_count', 'phone_number', 'website_uri')
+
+# Hotel columns kept as native lists/dicts in memory and JSON-encoded only when written to CSV
+HOTEL_JSON_COLUMNS = ('opening_hours', 'types', 'fuel_options')
+
+# Per-city dataset file suffixes consolidated into All India datasets, with report labels
+ALL_INDIA_DATASETS = (
+    ('hotels', 'hotels'),
+    ('reviews', 'reviews'),
+    ('hotel_landmarks', 'landmarks'),
+    ('locality', 'localities'),
+)
+
+
+def haversine_rad(lat1, lng1, lats, lngs, cos_lats=None):
+    """Haversine distance in km for inputs already in radians; cos_lats may be passed precomputed"""
+    if cos_lats is None:
+        cos_lats = np.cos(lats)
+    a = np.sin((lats - lat1) / 2) ** 2 + np.cos(lat1) * cos_lats * np.sin((lngs - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def haversine_vec(lat1, lng1, lats, lngs):
+    """Haversine distance in km, broadcasting over scalar or array lat/lng inputs"""
+    return haversine_rad(*map(np.radians, (lat1, lng1, lats, lngs)))
+
+
+def haversine_np(points: np.ndarray, landmarks: np.ndarray) -> np.ndarray:
+    """Pairwise haversine distances in km between (N, 2) and (K, 2) lat/lng arrays"""
+    return haversine_vec(points[:, 0, None], points[:, 1, None], landmarks[None, :, 0], landmarks[None, :, 1])
+
+
+def parse_float_array(values: List[str], column: str) -> np.ndarray:
+    """Parse numeric strings into a float64 array, logging and skipping any value that is not a number"""
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        parsed = []
+        for value in values:
+            try:
+                parsed.append(float(value))
+            except ValueError:
+                logger.warning(f"Skipping non-numeric {column} value: {value!r}")
+        return np.array(parsed, dtype=np.float64)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces calls to an API at a fixed rate"""
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, tokens: float = 1):
+        """Block until the requested number of tokens is available, then take them"""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot consume {tokens} tokens from a bucket of capacity {self.capacity}")
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait_time = (tokens - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class ResponseCache:
+    """SQLite-backed JSON cache with an in-memory front, safe to share between worker threads"""
+    def __init__(self, db_path: Path, ttl_seconds: Optional[float] = None):
+        self.memory: Dict[str, Any] = {}
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, isolation_level=None, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, created REAL)")
+        try:
+            # Caches created before entries were timestamped
+            self.conn.execute("ALTER TABLE cache ADD COLUMN created REAL")
+        except sqlite3.OperationalError:
+            pass
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or older than the TTL"""
+        with self.lock:
+            if key in self.memory:
+                return self.memory[key]
+            row = self.conn.execute("SELECT value, created FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl_seconds is not None and (row[1] is None or time.time() - row[1] > self.ttl_seconds):
+                return None
+            value = self.memory[key] = json.loads(row[0])
+            return value
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serialisable value under key"""
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, Any]):
+        """Store several JSON-serialisable values in a single transaction"""
+        if not items:
+            return
+        now = time.time()
+        with self.lock:
+            self.memory.update(items)
+            try:
+                self.conn.execute("BEGIN")
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                    ((key, json.dumps(value, separators=(',', ':')), now) for key, value in items.items())
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+                raise
+
+
 @dataclass
 class CityConfig:
     name: str
     state: str
     landmarks: Dict[str, Dict[str, Any]]
     search_strategies: List[str]
+    landmark_keys: Tuple[str, ...] = field(init=False, repr=False)
+    landmark_names: Tuple[str, ...] = field(init=False, repr=False)
+    landmarks_lat_rad: np.ndarray = field(init=False, repr=False)
+    landmarks_lng_rad: np.ndarray = field(init=False, repr=False)
+    landmarks_cos_lat: np.ndarray = field(init=False, repr=False)
+    landmark_coords: List[Dict[str, Any]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Landmarks as parallel arrays in landmarks order, with the trig the distance math reuses
+        self.landmark_keys = tuple(self.landmarks)
+        self.landmark_names = tuple(landmark['name'] for landmark in self.landmarks.values())
+        self.landmarks_lat_rad = np.radians(np.fromiter(
+            (landmark['lat'] for landmark in self.landmarks.values()), dtype=np.float64, count=len(self.landmarks)
+        ))
+        self.landmarks_lng_rad = np.radians(np.fromiter(
+            (landmark['lng'] for landmark in self.landmarks.values()), dtype=np.float64, count=len(self.landmarks)
+        ))
+        self.landmarks_cos_lat = np.cos(self.landmarks_lat_rad)
+        # Route matrix destinations, built once per config
+        self.landmark_coords = [
+            {
+                'lat': landmark_data['lat'],
+                'lng': landmark_data['lng'],
+                'landmark_key': landmark_key,
+                'landmark_name': landmark_data['name']
+            }
+            for landmark_key, landmark_data in self.landmarks.items()
+        ]
     
 
 class HotelDataFetcher:
+    # Overpass per-hotel filter templates, formatted with each hotel's lat/lng and unioned into one query
+    _Q_1KM_TMPL = """
+            node["amenity"~"^(hospital|clinic|doctors)$"](around:1000,{lat},{lng});
+            node["amenity"~"^(pharmacy)$"](around:1000,{lat},{lng});
+            node["amenity"~"^(bank|atm)$"](around:1000,{lat},{lng});
+            node["amenity"~"^(restaurant|cafe|food_court|fast_food)$"](around:1000,{lat},{lng});
+            node["shop"~"^(supermarket|mall|department_store)$"](around:1000,{lat},{lng});
+            node["leisure"~"^(park|playground|garden)$"](around:1000,{lat},{lng});"""
+    _Q_2_5KM_TMPL = """
+            node["amenity"~"^(fuel)$"](around:2500,{lat},{lng});
+            node["amenity"~"^(charging_station)$"](around:2500,{lat},{lng});
+            node["amenity"~"^(cinema|theatre)$"](around:2500,{lat},{lng});
+            node["public_transport"~"^(station|stop_position)$"](around:2500,{lat},{lng});
+            node["railway"~"^(station)$"](around:2500,{lat},{lng});
+            node["aeroway"~"^(aerodrome|terminal)$"](around:5000,{lat},{lng});"""
+    _Q_UNION_TMPL = """
+            [out:json][timeout:120];
+            ({filters}
+            );
+            out geom;
+            """
+
     def __init__(self):
         self.load_config()
         self.setup_api_keys()
         self.setup_rate_limits()
         self.setup_session()
+        self.setup_dedup_store()
+        self.overpass_cache = ResponseCache(self.OUTPUT_DIR / "overpass_cache.db")
+        # Driving distances rarely change; re-query routes after 30 days
+        self.route_cache = ResponseCache(self.OUTPUT_DIR / "route_cache.db", ttl_seconds=30 * 24 * 3600)
         self.request_counts = {
             'text_search': 0,
             'route_matrix': 0,
             'overpass': 0
         }
-        self.seen_place_ids = set()
         self.city_hotels = {}
         self._completed_stages = []
+        self._ensured_dirs: Set[Path] = set()
+        self._counts_lock = threading.Lock()
+        self._raw_handles: Dict[Tuple[str, str], Any] = {}
+        self._raw_lock = threading.Lock()
         
     def setup_session(self):
-        """Setup requests session with retry strategy"""
+        """Setup requests sessions; retries are handled by safe_request / make_request_with_retry only"""
         self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Enough pooled keep-alive connections for every concurrent Overpass worker; block rather than
+        # open throwaway connections that urllib3 would discard once the pool is full
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(10, self.OVERPASS_MAX_WORKERS), pool_block=True)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
+
+        # Dedicated keep-alive session for Google APIs so TLS connections are reused across calls
+        self.google_session = requests.Session()
+        self.google_session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=max(20, self.ROUTE_MATRIX_MAX_WORKERS), pool_block=True)
+        )
+        self.google_session.headers.update({'Connection': 'keep-alive'})
 
-    def rotate_headers(self):
+    def rotate_headers(self) -> Dict[str, str]:
         """Rotate user agent headers to avoid detection"""
         user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
         ]
-        self.session.headers.update({
-            'User-Agent': random.choice(user_agents)
-        })
+        # Returned per request rather than set on the shared session, which worker threads use concurrently
+        return {'User-Agent': random.choice(user_agents)}
 
     def load_config(self):
         """Load configuration settings"""
@@ -83,6 +411,12 @@ class HotelDataFetcher:
         self.TEST_RUN_COUNT = 5
         self.OUTPUT_DIR = Path("./out")
         self.OUTPUT_DIR.mkdir(exist_ok=True)
+        # Raw API responses are only dumped to out/<city>/raw when debugging
+        self.PERSIST_RAW = os.getenv('PERSIST_RAW_RESPONSES', '0') == '1'
+        # 'parquet' also writes a Parquet copy of every dataset CSV (requires pyarrow)
+        self.DATASET_FORMAT = os.getenv('DATASET_FORMAT', 'csv')
+        if self.DATASET_FORMAT == 'parquet' and not PARQUET_AVAILABLE:
+            raise ImportError("DATASET_FORMAT=parquet requires pyarrow")
         
     def setup_api_keys(self):
         """Load API keys from environment with validation"""
@@ -99,46 +433,59 @@ class HotelDataFetcher:
         """Setup API rate limits"""
         self.TEXT_SEARCH_MAX = int(os.getenv('TEXT_SEARCH_MAX_REQUESTS', '7000'))
         self.ROUTE_MATRIX_MAX = int(os.getenv('ROUTE_MATRIX_MAX_REQUESTS', '70000'))
-        
-        # Rate limiting counters with timestamps
-        self.rate_limit_counters = {
-            'text_search_per_minute': {'count': 0, 'reset_time': time.time() + 60},
-            'route_matrix_per_minute': {'count': 0, 'reset_time': time.time() + 60}
+        self.OVERPASS_MAX_WORKERS = int(os.getenv('OVERPASS_MAX_WORKERS', '4'))
+        self.ROUTE_MATRIX_MAX_WORKERS = int(os.getenv('ROUTE_MATRIX_MAX_WORKERS', '5'))
+        # Seconds a Text Search page token needs after being issued before it becomes valid
+        self.PAGE_TOKEN_DELAY = float(os.getenv('PAGE_TOKEN_DELAY', '1.0'))
+        
+        # Per-endpoint pacing: text search 600 requests/min, route matrix 3000 elements/min,
+        # Overpass about one query per second
+        self.buckets = {
+            'text_search': TokenBucket(rate=10, capacity=50),
+            'route_matrix': TokenBucket(rate=50, capacity=625),
+            'overpass': TokenBucket(rate=1.0, capacity=2)
         }
+
+    def share_rate_limits(self, workers: int):
+        """Split each API rate and request cap evenly across concurrent worker processes so their combined usage stays within limits"""
+        if workers > 1:
+            for bucket in self.buckets.values():
+                bucket.rate /= workers
+                # Capacity stays whole so a full route matrix batch still fits in one consume,
+                # but each process starts with only its share of the initial burst
+                bucket.tokens = bucket.capacity / workers
+            self.TEXT_SEARCH_MAX = max(1, self.TEXT_SEARCH_MAX // workers)
+            self.ROUTE_MATRIX_MAX = max(1, self.ROUTE_MATRIX_MAX // workers)
     
-    def check_rate_limit(self, api_type: str) -> bool:
-        """Check if we can make a request within rate limits"""
-        current_time = time.time()
-        counter_key = f"{api_type}_per_minute"
-        
-        if counter_key not in self.rate_limit_counters:
-            return True
-        
-        counter = self.rate_limit_counters[counter_key]
-        
-        # Reset counter if time window has passed
-        if current_time >= counter['reset_time']:
-            counter['count'] = 0
-            counter['reset_time'] = current_time + 60
-        
-        # Check limits
-        if api_type == 'text_search' and counter['count'] >= 600:
-            return False
-        elif api_type == 'route_matrix' and counter['count'] >= 3000:
-            return False
-        
-        return True
-    
-    def increment_rate_limit(self, api_type: str, count: int = 1):
-        """Increment rate limit counter"""
-        counter_key = f"{api_type}_per_minute"
-        if counter_key in self.rate_limit_counters:
-            self.rate_limit_counters[counter_key]['count'] += count
-    
+    def _ensure_dir(self, path: Path) -> Path:
+        """Create directory once and cache it to avoid repeated mkdir calls"""
+        if path not in self._ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
+        return path
+
+    def write_raw(self, city: str, kind: str, record: Dict):
+        """Append one raw API response to out/<city>/raw/<kind>.jsonl through a per-city open handle"""
+        try:
+            line = json.dumps({'ts': time.time(), **record}, separators=(',', ':')) + '\n'
+            with self._raw_lock:
+                handle = self._raw_handles.get((city, kind))
+                if handle is None:
+                    raw_dir = self._ensure_dir(self.OUTPUT_DIR / city / "raw")
+                    handle = self._raw_handles[(city, kind)] = open(raw_dir / f"{kind}.jsonl", 'a', encoding='utf-8')
+                handle.write(line)
+        except Exception as e:
+            logger.error(f"Failed to save raw {kind} response: {e}")
+
+    def close_raw_handles(self, city: str):
+        """Flush and close the raw response files opened for a city"""
+        with self._raw_lock:
+            for key in [key for key in self._raw_handles if key[0] == city]:
+                self._raw_handles.pop(key).close()
+
     def save_progress(self, city: str, stage: str, data: Dict = None):
         """Save progress to enable resumption after crashes"""
-        progress_dir = self.OUTPUT_DIR / city / ".progress"
-        progress_dir.mkdir(parents=True, exist_ok=True)
+        progress_dir = self._ensure_dir(self.OUTPUT_DIR / city / ".progress")
         
         progress_file = progress_dir / "progress.json"
         
@@ -154,9 +501,12 @@ class HotelDataFetcher:
         
         self._completed_stages = progress_data['completed_stages']
         
+        # Write to a temp file and swap it in so a crash never leaves a truncated progress file
+        tmp_file = progress_file.with_suffix('.json.tmp')
         try:
-            with open(progress_file, 'w') as f:
-                json.dump(progress_data, f, indent=2)
+            with open(tmp_file, 'w') as f:
+                json.dump(progress_data, f, separators=(',', ':'))
+            os.replace(tmp_file, progress_file)
         except Exception as e:
             logger.error(f"Failed to save progress: {e}")
     
@@ -175,8 +525,10 @@ class HotelDataFetcher:
         
         return {'stage': 'start', 'completed_stages': [], 'data': {}}
         
-    def get_city_config(self) -> Dict[str, CityConfig]:
-        """Get city configurations with landmarks and search strategies"""
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_city_config() -> Dict[str, CityConfig]:
+        """Get city configurations with landmarks and search strategies (built once per process)"""
         return {
             "Delhi": CityConfig(
                 name="Delhi",
@@ -456,64 +808,89 @@ class HotelDataFetcher:
             )            
         }
 
-    def load_seen_place_ids(self, city: str) -> Set[str]:
-        """Load seen place IDs to avoid duplicates"""
+    def setup_dedup_store(self):
+        """Open the SQLite store used for persistent place deduplication"""
+        self.dedup = sqlite3.connect(self.OUTPUT_DIR / "dedup.db", isolation_level=None, timeout=60)
+        self.dedup.execute("PRAGMA journal_mode=WAL")
+        self.dedup.execute("CREATE TABLE IF NOT EXISTS seen (city TEXT, key TEXT, PRIMARY KEY (city, key))")
+
+    def import_legacy_seen_place_ids(self, city: str):
+        """Import seen place IDs saved by older runs as mappings/seen_place_ids.json"""
         seen_file = self.OUTPUT_DIR / city / "mappings" / "seen_place_ids.json"
         if seen_file.exists():
             try:
                 with open(seen_file, 'r') as f:
-                    return set(json.load(f))
+                    self.save_seen_place_ids(city, set(json.load(f)))
             except Exception as e:
-                logger.error(f"Failed to load seen place IDs: {e}")
-                return set()
-        return set()
+                logger.error(f"Failed to import seen place IDs: {e}")
+
+    def is_seen(self, city: str, key: str) -> bool:
+        """Check whether a place ID or coordinate hash was stored by a previous run"""
+        return self.dedup.execute(
+            "SELECT 1 FROM seen WHERE city = ? AND key = ?", (city, key)
+        ).fetchone() is not None
 
     def save_seen_place_ids(self, city: str, place_ids: Set[str]):
-        """Save seen place IDs for persistent deduplication"""
-        mappings_dir = self.OUTPUT_DIR / city / "mappings"
-        mappings_dir.mkdir(parents=True, exist_ok=True)
-        
-        seen_file = mappings_dir / "seen_place_ids.json"
+        """Save seen place IDs for persistent deduplication in a single transaction"""
         try:
-            with open(seen_file, 'w') as f:
-                json.dump(list(place_ids), f)
+            self.dedup.execute("BEGIN")
+            self.dedup.executemany(
+                "INSERT OR IGNORE INTO seen VALUES (?, ?)", ((city, key) for key in place_ids)
+            )
+            self.dedup.execute("COMMIT")
         except Exception as e:
+            if self.dedup.in_transaction:
+                self.dedup.execute("ROLLBACK")
             logger.error(f"Failed to save seen place IDs: {e}")
 
     def make_request_with_retry(self, url: str, headers: Dict = None, body: str = None,
-                          max_retries: int = 3, backoff_factor: float = 1.0) -> requests.Response:
-        """Make HTTP request with exponential backoff retry - Enhanced for 429 handling"""
+                          max_retries: int = 3, backoff_factor: float = 1.0,
+                          retry_invalid_request: bool = False) -> requests.Response:
+        """Make HTTP request with a single exponential backoff retry loop - honours Retry-After on 429,
+        and with retry_invalid_request retries one 400 (a page token that is not valid yet)"""
         for attempt in range(max_retries):
+            wait_time = min(backoff_factor * (2 ** attempt), 120)
             try:
-                response = requests.post(url, headers=headers, json=body, timeout=30)
+                response = self.google_session.post(url, headers=headers, json=body, timeout=30)
                     
                 if response.status_code == 200:
                     return response
-                elif response.status_code == 429:  # Rate limit
-                    # Check if Retry-After header is present
-                    retry_after = response.headers.get('Retry-After')
-                    if retry_after:
-                        try:
-                            wait_time = int(retry_after)
-                        except ValueError:
-                            wait_time = backoff_factor * (2 ** attempt)
-                    else:
-                        wait_time = backoff_factor * (2 ** attempt)
-                    
-                    # Cap maximum wait time at 5 minutes
-                    wait_time = min(wait_time, 120)
-                    logger.warning(f"Rate limited (429), waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                    time.sleep(wait_time)
+                if response.status_code == 429:  # Rate limit
+                    # Prefer the server supplied Retry-After over our own backoff
+                    retry_after = self.parse_retry_after(response)
+                    if retry_after is not None:
+                        wait_time = retry_after
+                    logger.warning(f"Rate limited (429) on attempt {attempt + 1}/{max_retries}")
+                elif response.status_code >= 500:
+                    logger.warning(f"HTTP {response.status_code} on attempt {attempt + 1}/{max_retries}")
+                elif response.status_code == 400 and retry_invalid_request:
+                    retry_invalid_request = False
+                    wait_time = max(wait_time, self.PAGE_TOKEN_DELAY)
+                    logger.warning(f"HTTP 400 for page token on attempt {attempt + 1}/{max_retries}, token may not be valid yet")
                 else:
                     logger.error(f"HTTP {response.status_code}: {response.text}")
                     break
             except requests.exceptions.RequestException as e:
                 logger.error(f"Request failed (attempt {attempt + 1}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(backoff_factor * (2 ** attempt))
+            
+            # Don't sleep after the final attempt
+            if attempt < max_retries - 1:
+                logger.info(f"Waiting {wait_time}s before retry {attempt + 2}/{max_retries}")
+                time.sleep(wait_time)
         
         return None
 
+    @staticmethod
+    def parse_retry_after(response: requests.Response, cap: float = 120) -> Optional[float]:
+        """Return the Retry-After delay in seconds (capped), or None if absent or not numeric"""
+        retry_after = response.headers.get('Retry-After')
+        if not retry_after:
+            return None
+        try:
+            return min(max(float(retry_after), 0.0), cap)
+        except ValueError:
+            return None
+
     def search_hotels_text_search(self, city_config: CityConfig, max_hotels: int = 250) -> List[Dict]:
         """Search for hotels using Google Places Text Search API"""
         logger.info(f"Starting hotel search for {city_config.name}")
@@ -532,129 +909,108 @@ class HotelDataFetcher:
                     logger.error(f"Failed to load existing hotels data: {e}")
         
         hotels = []
-        seen_place_ids = self.load_seen_place_ids(city_config.name)
-        
-        # Create output directories
-        city_dir = self.OUTPUT_DIR / city_config.name
-        raw_dir = city_dir / "raw"
-        raw_dir.mkdir(parents=True, exist_ok=True)
+        self.import_legacy_seen_place_ids(city_config.name)
+        # Keys seen during this run; persisted once the stage completes
+        new_place_ids = set()
         
         base_url = "https://places.googleapis.com/v1/places:searchText"
         
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Goog-Api-Key': self.google_api_key,
+            'X-Goog-FieldMask': '*',
+        }
+        
         try:
-            for strategy_idx, query in enumerate(city_config.search_strategies):
-                if len(hotels) >= max_hotels:
-                    break
-                    
-                logger.info(f"Searching with strategy: {query}")
-                
-                headers = {
-                    'Content-Type': 'application/json',
-                    'X-Goog-Api-Key': self.google_api_key,
-                    'X-Goog-FieldMask': '*',
-                }
-                body = {
-                    'textQuery': query,
-                    'includedType': 'lodging'
-                }
-                
-                page_num = 0
-                next_page_token = None
-                
-                while len(hotels) < max_hotels:
-                    if next_page_token:
-                        body['pageToken'] = next_page_token  
-                    # Check rate limits
-                    if not self.check_rate_limit('text_search'):
-                        logger.warning("Text Search rate limit reached, waiting 30 seconds...")
-                        time.sleep(30)
-                        continue
-                    
-                    if self.request_counts['text_search'] >= self.TEXT_SEARCH_MAX:
-                        logger.warning("Text Search API daily limit reached")
+            # A single background thread fetches the next page while the current one is processed
+            with ThreadPoolExecutor(max_workers=1) as page_executor:
+                for strategy_idx, query in enumerate(city_config.search_strategies):
+                    if len(hotels) >= max_hotels:
                         break
+                        
+                    logger.info(f"Searching with strategy: {query}")
                     
-                    response = self.make_request_with_retry(base_url, headers, body)
-                    if not response:
-                        logger.error(f"Failed to get response for query: {query}")
-                        break
+                    def fetch_page(page_token: Optional[str], token_issued: Optional[float] = None):
+                        if self.request_counts['text_search'] >= self.TEXT_SEARCH_MAX:
+                            logger.warning("Text Search API daily limit reached")
+                            return None
+                        return page_executor.submit(self._post_page, base_url, headers, query, page_token, token_issued)
                     
-                    try:
-                        data = response.json()
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Invalid JSON response: {e}")
-                        break
-                    
-                    self.request_counts['text_search'] += 1
-                    self.increment_rate_limit('text_search')
-                    
-                    # Save raw response
-                    raw_file = raw_dir / f"text_search_{strategy_idx}_{page_num}.json"
-                    try:
-                        with open(raw_file, 'w') as f:
-                            json.dump(data, f, indent=2)
-                    except Exception as e:
-                        logger.error(f"Failed to save raw response: {e}")
+                    page_num = 0
+                    future = fetch_page(None)
                     
-                    if 'places' not in data or not data['places']:
-                        logger.info(f"No results found for query: {query}")
-                        break
-                    
-                    # Process results
-                    page_hotels = []
-                    for place in data['places']:
-                        try:
-                            place_id = place.get('id')
-                            if not place_id or place_id in seen_place_ids:
-                                continue
-                            
-                            # Validate essential fields
-                   
-                            if not self.validate_hotel_data(place):
-                                logger.warning(f"Invalid hotel data for place_id: {place_id}")
-                                continue
-                            
-                            # Fallback deduplication using name and coordinates
-                            name = place.get('displayName', '').get('text','')
-                            lat = place.get('location', {}).get('latitude')
-                            lng = place.get('location', {}).get('longitude')
-                            
-                            if lat and lng:
+                    while future is not None:
+                        data = future.result()
+                        token_issued = time.monotonic()
+                        future = None
+                        if data is None:
+                            logger.error(f"Failed to get response for query: {query}")
+                            break
+                        
+                        # Save raw response (debug only)
+                        if self.PERSIST_RAW:
+                            self.write_raw(city_config.name, 'text_search',
+                                           {'strategy': strategy_idx, 'page': page_num, 'data': data})
+                        
+                        if 'places' not in data or not data['places']:
+                            logger.info(f"No results found for query: {query}")
+                            break
+                        
+                        # Prefetch the next page now, unless this page alone could fill the quota
+                        next_page_token = data.get('nextPageToken')
+                        if next_page_token and len(hotels) + len(data['places']) < max_hotels:
+                            future = fetch_page(next_page_token, token_issued)
+                        
+                        # Process results
+                        page_hotels = []
+                        for place in data['places']:
+                            try:
+                                place_id = place.get('id')
+                                if (not place_id or place_id in new_place_ids or
+                                        self.is_seen(city_config.name, place_id)):
+                                    continue
+                                
+                                # Validate essential fields, most commonly missing first:
+                                # location with non-zero lat/lng, then displayName
+                                location = place.get('location') or _EMPTY_DICT
+                                lat = location.get('latitude')
+                                lng = location.get('longitude')
+                                display_name = place.get('displayName')
+                                if not lat or not lng or display_name is None:
+                                    logger.warning(f"Invalid hotel data for place_id: {place_id}")
+                                    continue
+                                
+                                # Fallback deduplication using name and coordinates
+                                name = display_name.get('text', '')
                                 coord_key = f"{name}_{lat:.6f}_{lng:.6f}"
                                 coord_hash = hashlib.md5(coord_key.encode()).hexdigest()
                                 
-                                if coord_hash in seen_place_ids:
+                                if coord_hash in new_place_ids or self.is_seen(city_config.name, coord_hash):
                                     continue
-                                seen_place_ids.add(coord_hash)
-                            
-                            seen_place_ids.add(place_id)
-                            page_hotels.append(place)
-                        except Exception as e:
-                            logger.error(f"Error processing hotel data: {e}")
-                            continue
-                    
-                    hotels.extend(page_hotels)
-                    logger.info(f"Found {len(page_hotels)} new hotels (total: {len(hotels)})")
-                    
-                    
-                    
-                    if 'pageToken' in body:
-                        del body['pageToken']  
-
-                    # Check for next page
-                    next_page_token = data.get('nextPageToken')
-                    if not next_page_token:
-                        break
-                    
-                    page_num += 1
-                    time.sleep(1)  # Reduced delay for next page token
-                    
+                                new_place_ids.add(coord_hash)
+                                
+                                new_place_ids.add(place_id)
+                                page_hotels.append(place)
+                            except Exception as e:
+                                logger.error(f"Error processing hotel data: {e}")
+                                continue
+                        
+                        hotels.extend(page_hotels)
+                        logger.info(f"Found {len(page_hotels)} new hotels (total: {len(hotels)})")
+                        
+                        # Check for next page
+                        if not next_page_token or len(hotels) >= max_hotels:
+                            break
+                        if future is None:
+                            future = fetch_page(next_page_token, token_issued)
+                        
+                        page_num += 1
             
             # Save final results
             self.save_intermediate_hotels(city_config.name, hotels)
             
             # Save seen place IDs
-            self.save_seen_place_ids(city_config.name, seen_place_ids)
+            self.save_seen_place_ids(city_config.name, new_place_ids)
             
             # Mark stage as completed
             if hotels:
@@ -672,30 +1028,45 @@ class HotelDataFetcher:
         
         return hotels
     
-    def validate_hotel_data(self, hotel: Dict) -> bool:
-        """Validate essential hotel data fields"""
-        required_fields = ['id', 'displayName', 'location']
+    def _post_page(self, url: str, headers: Dict, query: str, page_token: Optional[str] = None,
+                   token_issued: Optional[float] = None) -> Optional[Dict]:
+        """Fetch one Text Search results page, returns the parsed JSON or None on failure"""
+        body = {
+            'textQuery': query,
+            'includedType': 'lodging'
+        }
+        if page_token:
+            body['pageToken'] = page_token
+            # A page token is rejected until a short delay after the page that issued it
+            if token_issued is not None:
+                wait_time = self.PAGE_TOKEN_DELAY - (time.monotonic() - token_issued)
+                if wait_time > 0:
+                    time.sleep(wait_time)
         
-        for field in required_fields:
-            if field not in hotel or hotel[field] is None:
-                return False
+        # Wait for rate limit capacity
+        self.buckets['text_search'].consume()
+        response = self.make_request_with_retry(url, headers, body, retry_invalid_request=bool(page_token))
+        if not response:
+            return None
         
-        # Validate geometry has location with lat/lng
-        location = hotel.get('location', {})
-        if not location.get('latitude') or not location.get('longitude'):
-            return False
+        try:
+            data = response.json()
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON response: {e}")
+            return None
         
-        return True
-    
+        with self._counts_lock:
+            self.request_counts['text_search'] += 1
+        return data
+
     def save_intermediate_hotels(self, city: str, hotels: List[Dict]):
         """Save intermediate hotels data for crash recovery"""
-        city_dir = self.OUTPUT_DIR / city
-        city_dir.mkdir(exist_ok=True)
+        city_dir = self._ensure_dir(self.OUTPUT_DIR / city)
         
         try:
             hotels_file = city_dir / "hotels_raw.json"
             with open(hotels_file, 'w') as f:
-                json.dump(hotels, f, indent=2)
+                json.dump(hotels, f, separators=(',', ':'))
         except Exception as e:
             logger.error(f"Failed to save intermediate hotels data: {e}")
 
@@ -719,56 +1090,51 @@ class HotelDataFetcher:
             logger.warning("Route matrix batch too large, splitting...")
             return self.get_route_matrix_batch(valid_origins, valid_destinations, city)
         
-        # Check rate limits
-        if not self.check_rate_limit('route_matrix'):
-            logger.warning("Route Matrix rate limit reached, waiting 60 seconds...")
-            time.sleep(60)
-        
-        if self.request_counts['route_matrix'] + elements_count > self.ROUTE_MATRIX_MAX:
-            logger.warning("Route Matrix API daily limit would be exceeded")
-            return {}
-        
-        url = "https://routes.googleapis.com/distanceMatrix/v2:computeRouteMatrix"
-        
         # Format origins and destinations correctly
-        formatted_origins = []
-        for origin in valid_origins:
-            try:
-                formatted_origins.append({
-                    "waypoint": {
-                        "location": {
-                            "latLng": {
-                                "latitude": float(origin['lat']),
-                                "longitude": float(origin['lng'])
-                            }
-                        }
-                    }
-                })
-            except (ValueError, TypeError) as e:
-                logger.error(f"Invalid origin coordinates: {e}")
-                continue
-        
-        formatted_destinations = []
-        for dest in valid_destinations:
-            try:
-                formatted_destinations.append({
-                    "waypoint": {
-                        "location": {
-                            "latLng": {
-                                "latitude": float(dest['lat']),
-                                "longitude": float(dest['lng'])
-                            }
-                        }
-                    }
-                })
-            except (ValueError, TypeError) as e:
-                logger.error(f"Invalid destination coordinates: {e}")
-                continue
+        formatted_origins = self.format_waypoints(valid_origins, 'origin')
+        formatted_destinations = self.format_waypoints(valid_destinations, 'destination')
         
         if not formatted_origins or not formatted_destinations:
             logger.error("No valid formatted coordinates for route matrix")
             return {}
         
+        return self._route_matrix_one(formatted_origins, formatted_destinations, city)
+
+    def format_waypoints(self, points: List[Dict], kind: str) -> List[Dict]:
+        """Format lat/lng points as Routes API waypoints, dropping points without finite coordinates"""
+        try:
+            lats = np.fromiter((np.nan if p.get('lat') is None else p['lat'] for p in points), dtype=np.float64, count=len(points))
+            lngs = np.fromiter((np.nan if p.get('lng') is None else p['lng'] for p in points), dtype=np.float64, count=len(points))
+        except (ValueError, TypeError) as e:
+            logger.error(f"Invalid {kind} coordinates: {e}")
+            return []
+        
+        mask = np.isfinite(lats) & np.isfinite(lngs)
+        if not mask.all():
+            logger.error(f"Dropping {int((~mask).sum())} {kind} points with invalid coordinates")
+        
+        return [
+            {"waypoint": {"location": {"latLng": {"latitude": lat, "longitude": lng}}}}
+            for lat, lng in zip(lats[mask].tolist(), lngs[mask].tolist())
+        ]
+
+    def _route_matrix_one(self, formatted_origins: List[Dict], formatted_destinations: List[Dict],
+                          city: str) -> Dict:
+        """Send a single route matrix request of at most 625 elements, safe to call from worker threads"""
+        elements_count = len(formatted_origins) * len(formatted_destinations)
+        
+        # Reserve the elements against the daily limit up front so concurrent requests can't overshoot it
+        with self._counts_lock:
+            if self.request_counts['route_matrix'] + elements_count > self.ROUTE_MATRIX_MAX:
+                logger.warning("Route Matrix API daily limit would be exceeded")
+                return {}
+            self.request_counts['route_matrix'] += elements_count
+        
+        # Wait for rate limit capacity (billed per element)
+        self.buckets['route_matrix'].consume(elements_count)
+        
+        url = "https://routes.googleapis.com/distanceMatrix/v2:computeRouteMatrix"
+        
         payload = {
             "origins": formatted_origins,
             "destinations": formatted_destinations,
@@ -784,27 +1150,17 @@ class HotelDataFetcher:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self.google_session.post(url, json=payload, headers=headers, timeout=30)
             if response.status_code == 200:
-                self.request_counts['route_matrix'] += len(formatted_origins) * len(formatted_destinations)
-                self.increment_rate_limit('route_matrix', len(formatted_origins) * len(formatted_destinations))
-                
                 try:
                     result = response.json()
                 except json.JSONDecodeError as e:
                     logger.error(f"Invalid JSON in route matrix response: {e}")
                     return {}
                 
-                # Save raw response
-                raw_dir = self.OUTPUT_DIR / city / "raw"
-                raw_dir.mkdir(parents=True, exist_ok=True)
-                timestamp = int(time.time())
-                raw_file = raw_dir / f"route_matrix_{timestamp}.json"
-                try:
-                    with open(raw_file, 'w') as f:
-                        json.dump(result, f, indent=2)
-                except Exception as e:
-                    logger.error(f"Failed to save route matrix response: {e}")
+                # Save raw response (debug only)
+                if self.PERSIST_RAW:
+                    self.write_raw(city, 'route_matrix', {'data': result})
                 
                 # Handle different response formats
                 if isinstance(result, list):
@@ -816,320 +1172,290 @@ class HotelDataFetcher:
                     return {'matrix': result if isinstance(result, list) else []}
             else:
                 logger.error(f"Route Matrix API error: {response.status_code} - {response.text}")
-                return {}
         except requests.exceptions.RequestException as e:
             logger.error(f"Route Matrix API request failed: {e}")
-            return {}
-
-    def calculate_distance(self, lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-        """Calculate straight-line distance between two points using Haversine formula"""
-        from math import radians, cos, sin, asin, sqrt
-        
-        # Convert decimal degrees to radians
-        lat1, lng1, lat2, lng2 = map(radians, [lat1, lng1, lat2, lng2])
         
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlng = lng2 - lng1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlng/2)**2
-        c = 2 * asin(sqrt(a))
-        r = 6371  # Radius of earth in kilometers
-        
-        return c * r
+        # Failed requests are not billed; release the reserved elements
+        with self._counts_lock:
+            self.request_counts['route_matrix'] -= elements_count
+        return {}
 
-    def query_overpass_pois(self, lat: float, lng: float, city: str, hotel_idx: int) -> Dict:
-        """Query Overpass API for POI data around hotel location"""
+    @staticmethod
+    def calculate_distance(lat1: float, lng1: float, lat2, lng2):
+        """Calculate straight-line distance from one point to one or many points using Haversine formula"""
+        return haversine_vec(lat1, lng1, lat2, lng2)
+
+    def build_overpass_query_1km(self, hotels_chunk: List[Tuple[int, float, float]]) -> str:
+        """Build a single Overpass query for the 1km POI categories around every hotel in the chunk"""
+        filters = "".join(self._Q_1KM_TMPL.format(lat=lat, lng=lng) for _, lat, lng in hotels_chunk)
+        return self._Q_UNION_TMPL.format(filters=filters)
+
+    def build_overpass_query_2_5km(self, hotels_chunk: List[Tuple[int, float, float]]) -> str:
+        """Build a single Overpass query for the 2.5km POI categories around every hotel in the chunk"""
+        filters = "".join(self._Q_2_5KM_TMPL.format(lat=lat, lng=lng) for _, lat, lng in hotels_chunk)
+        return self._Q_UNION_TMPL.format(filters=filters)
+
+    def chunk_hotels_for_overpass(self, hotels_coords: List[Tuple[int, float, float]],
+                                  max_query_chars: int = 8000) -> List[List[Tuple[int, float, float]]]:
+        """Group hotels into chunks whose URL-encoded Overpass queries stay under max_query_chars"""
+        # Queries are sent as GET parameters, so budget the percent-encoded length of the
+        # wrapper plus, per hotel, whichever radius' filter block encodes longer
+        base_chars = len(quote_plus(self._Q_UNION_TMPL.format(filters="")))
+        chunks = []
+        current = []
+        current_chars = base_chars
+        for hotel_coords in hotels_coords:
+            _, lat, lng = hotel_coords
+            filter_chars = max(len(quote_plus(self._Q_1KM_TMPL.format(lat=lat, lng=lng))),
+                               len(quote_plus(self._Q_2_5KM_TMPL.format(lat=lat, lng=lng))))
+            if current and current_chars + filter_chars > max_query_chars:
+                chunks.append(current)
+                current = []
+                current_chars = base_chars
+            current.append(hotel_coords)
+            current_chars += filter_chars
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def split_overpass_elements(self, elements: List[Dict], hotels_chunk: List[Tuple[int, float, float]],
+                                radius_m) -> List[List[Dict]]:
+        """Assign POI nodes from a batched response back to each hotel within the element's search radius"""
+        if not elements:
+            return [[] for _ in hotels_chunk]
+        
+        # One (elements x hotels) distance matrix instead of a scalar haversine per pair
+        element_points = np.array([(element['lat'], element['lon']) for element in elements], dtype=np.float64)
+        hotel_points = np.array([(lat, lng) for _, lat, lng in hotels_chunk], dtype=np.float64)
+        radius_km = np.array([radius_m(element['tags']) for element in elements], dtype=np.float64) / 1000
+        within = haversine_np(element_points, hotel_points) <= radius_km[:, None]
+        
+        return [[elements[i] for i in np.flatnonzero(within[:, pos])] for pos in range(len(hotels_chunk))]
+
+    def parse_overpass_nodes(self, response: requests.Response) -> List[Dict]:
+        """Parse an Overpass response keeping only the node fields used for POI counting"""
+        return [
+            {'type': 'node', 'lat': element['lat'], 'lon': element['lon'], 'tags': element.get('tags', {})}
+            for element in response.json().get('elements', [])
+            if element.get('type') == 'node' and 'lat' in element
+        ]
+
+    def query_overpass_pois_batch(self, hotels_chunk: List[Tuple[int, float, float]],
+                                  city: str) -> Tuple[List[Optional[Tuple[List[Dict], List[Dict]]]], bool]:
+        """Query Overpass API once per radius for a chunk of hotels, returns (1km, 2.5km) POI nodes per hotel in chunk order
+        and whether both radius queries succeeded"""
+        first_idx, last_idx = hotels_chunk[0][0], hotels_chunk[-1][0]
         try:
             overpass_url = "http://overpass-api.de/api/interpreter"
             
-            # Step 1: Query POIs within 1000m (1km)
-            query_1km = f"""
-            [out:json][timeout:60];
-            (
-            node["amenity"~"^(hospital|clinic|doctors)$"](around:1000,{lat},{lng});
-            node["amenity"~"^(pharmacy)$"](around:1000,{lat},{lng});
-            node["amenity"~"^(bank|atm)$"](around:1000,{lat},{lng});
-            node["amenity"~"^(restaurant|cafe|food_court|fast_food)$"](around:1000,{lat},{lng});
-            node["shop"~"^(supermarket|mall|department_store)$"](around:1000,{lat},{lng});
-            node["leisure"~"^(park|playground|garden)$"](around:1000,{lat},{lng});
-            );
-            out geom;
-            """
+            # Step 1: Query POIs within 1000m (1km) of any hotel in the chunk
+            query_1km = self.build_overpass_query_1km(hotels_chunk)
             
-            # Step 2: Query POIs within 2500m (2.5km)
-            query_2_5km = f"""
-            [out:json][timeout:60];
-            (
-            node["amenity"~"^(fuel)$"](around:2500,{lat},{lng});
-            node["amenity"~"^(charging_station)$"](around:2500,{lat},{lng});
-            node["amenity"~"^(cinema|theatre)$"](around:2500,{lat},{lng});
-            node["public_transport"~"^(station|stop_position)$"](around:2500,{lat},{lng});
-            node["railway"~"^(station)$"](around:2500,{lat},{lng});
-            node["aeroway"~"^(aerodrome|terminal)$"](around:5000,{lat},{lng});
-            );
-            out geom;
-            """
+            # Step 2: Query POIs within 2500m (2.5km) of any hotel in the chunk
+            query_2_5km = self.build_overpass_query_2_5km(hotels_chunk)
             
-            logger.info(f"Querying Overpass API for hotel {hotel_idx} at {lat}, {lng}")
+            logger.info(f"Querying Overpass API for hotels {first_idx}-{last_idx} ({len(hotels_chunk)} hotels)")
             
             # Execute first query (1km) with enhanced retry
-            response_1km = self.safe_request(overpass_url, params={'data': query_1km}, timeout=90)
-            pois_1km = {}
+            response_1km = self.safe_request(overpass_url, params={'data': query_1km}, timeout=150)
+            pois_1km = None
             if response_1km and response_1km.status_code == 200:
                 try:
-                    pois_1km = response_1km.json()
-                    logger.info(f"1km query returned {len(pois_1km.get('elements', []))} POIs for hotel {hotel_idx}")
+                    pois_1km = self.parse_overpass_nodes(response_1km)
+                    logger.info(f"1km query returned {len(pois_1km)} POIs for hotels {first_idx}-{last_idx}")
                 except json.JSONDecodeError as e:
                     logger.error(f"Invalid JSON from Overpass API (1km): {e}")
-                    pois_1km = {}
             else:
-                logger.warning(f"1km Overpass API request failed for hotel {hotel_idx}: {response_1km.status_code if response_1km else 'No response'}")
-            
-            # Small delay between queries
-            time.sleep(0.5)
+                logger.warning(f"1km Overpass API request failed for hotels {first_idx}-{last_idx}: {response_1km.status_code if response_1km else 'No response'}")
             
             # Execute second query (2.5km) with enhanced retry
-            response_2_5km = self.safe_request(overpass_url, params={'data': query_2_5km}, timeout=90)
-            pois_2_5km = {}
+            response_2_5km = self.safe_request(overpass_url, params={'data': query_2_5km}, timeout=150)
+            pois_2_5km = None
             if response_2_5km and response_2_5km.status_code == 200:
                 try:
-                    pois_2_5km = response_2_5km.json()
-                    logger.info(f"2.5km query returned {len(pois_2_5km.get('elements', []))} POIs for hotel {hotel_idx}")
+                    pois_2_5km = self.parse_overpass_nodes(response_2_5km)
+                    logger.info(f"2.5km query returned {len(pois_2_5km)} POIs for hotels {first_idx}-{last_idx}")
                 except json.JSONDecodeError as e:
                     logger.error(f"Invalid JSON from Overpass API (2.5km): {e}")
-                    pois_2_5km = {}
             else:
-                logger.warning(f"2.5km Overpass API request failed for hotel {hotel_idx}: {response_2_5km.status_code if response_2_5km else 'No response'}")
+                logger.warning(f"2.5km Overpass API request failed for hotels {first_idx}-{last_idx}: {response_2_5km.status_code if response_2_5km else 'No response'}")
             
-            self.request_counts['overpass'] += 2  # Two queries made
+            with self._counts_lock:
+                self.request_counts['overpass'] += 2  # Two queries made
             
-            # Combine results for saving
-            combined_data = {
-                'pois_1km': pois_1km,
-                'pois_2_5km': pois_2_5km
-            }
+            # Save raw response (debug only)
+            if self.PERSIST_RAW:
+                self.write_raw(city, 'overpass', {
+                    'hotels': [first_idx, last_idx], 'data': {'pois_1km': pois_1km, 'pois_2_5km': pois_2_5km}
+                })
             
-            # Save raw response
-            try:
-                raw_dir = self.OUTPUT_DIR / city / "raw"
-                raw_dir.mkdir(parents=True, exist_ok=True)
-                raw_file = raw_dir / f"overpass_{hotel_idx}.json"
-                with open(raw_file, 'w') as f:
-                    json.dump(combined_data, f, indent=2)
-                logger.debug(f"Saved Overpass data to {raw_file}")
-            except Exception as e:
-                logger.error(f"Failed to save Overpass response: {e}")
+            if pois_1km is None and pois_2_5km is None:
+                return [None for _ in hotels_chunk], False
             
-            return combined_data
+            # Demultiplex the combined results; aerodromes/terminals were queried with a 5km radius
+            split_1km = self.split_overpass_elements(pois_1km or [], hotels_chunk, lambda tags: 1000)
+            split_2_5km = self.split_overpass_elements(
+                pois_2_5km or [], hotels_chunk,
+                lambda tags: 5000 if tags.get('aeroway') in ('aerodrome', 'terminal') else 2500
+            )
+            
+            # A failed radius is filled with no POIs for this run only; it is not complete enough to cache
+            return list(zip(split_1km, split_2_5km)), pois_1km is not None and pois_2_5km is not None
             
         except Exception as e:
-            logger.error(f"Overpass API query failed for hotel {hotel_idx}: {e}")
+            logger.error(f"Overpass API query failed for hotels {first_idx}-{last_idx}: {e}")
         
-        return {}
+        return [None for _ in hotels_chunk], False
 
-    def process_overpass_pois(self, overpass_data: Dict, hotel_lat: float, hotel_lng: float) -> Dict:
-        """Process Overpass API POI data"""
-        if not overpass_data:
-            logger.warning("No POI data to process")
-            return self.get_empty_locality_features()
-        
-        pois_1km_data = overpass_data.get('pois_1km', {})
-        pois_2_5km_data = overpass_data.get('pois_2_5km', {})
-        
-        # Initialize counters for 1km POIs
-        counts_1km = {
-            'hospitals': 0,
-            'pharmacies': 0,
-            'banks': 0,
-            'restaurants': 0,
-            'shopping': 0,
-            'parks': 0
-        }
-        
-        # Initialize counters for 2.5km POIs
-        counts_2_5km = {
-            'fuel_stations': 0,
-            'ev_charging': 0,
-            'entertainment': 0,
-            'public_transport': 0
-        }
+    def count_overpass_pois(self, elements_1km: List[Dict], elements_2_5km: List[Dict]) -> np.ndarray:
+        """Count one hotel's Overpass POI nodes, returns counts in POI_COUNT_COLUMNS_1KM + _2_5KM order"""
+        return np.concatenate([
+            self.count_pois(elements_1km, POI_CATEGORY_IDS_1KM, len(POI_COUNT_COLUMNS_1KM)),
+            self.count_pois(elements_2_5km, POI_CATEGORY_IDS_2_5KM, len(POI_COUNT_COLUMNS_2_5KM))
+        ])
+
+    def count_pois(self, elements: List[Dict], category_ids: Dict[str, Dict[str, int]],
+                   n_categories: int) -> np.ndarray:
+        """Count POI nodes per category id using a tag dispatch table"""
+        ids = []
+        for element in elements:
+            if element.get('type') != 'node':
+                continue
+            
+            tags = element.get('tags')
+            if not tags:
+                continue
+            
+            # Categorise POIs (no distance check needed since query already filtered)
+            for key, table in category_ids.items():
+                category = table.get(tags.get(key))
+                if category is not None:
+                    ids.append(category)
+                    break
         
-        # Process 1km POIs
-        if 'elements' in pois_1km_data:
-            logger.info(f"Processing {len(pois_1km_data['elements'])} 1km POI elements")
-            for element in pois_1km_data['elements']:
-                if element.get('type') != 'node':
-                    continue
-                
-                tags = element.get('tags', {})
-                amenity = tags.get('amenity', '')
-                shop = tags.get('shop', '')
-                leisure = tags.get('leisure', '')
-                
-                # Count POIs by category (no distance check needed since query already filtered)
-                if amenity in ['hospital', 'clinic', 'doctors']:
-                    counts_1km['hospitals'] += 1
-                elif amenity == 'pharmacy':
-                    counts_1km['pharmacies'] += 1
-                elif amenity in ['bank', 'atm']:
-                    counts_1km['banks'] += 1
-                elif amenity in ['restaurant', 'cafe', 'food_court', 'fast_food']:
-                    counts_1km['restaurants'] += 1
-                elif shop in ['supermarket', 'mall', 'department_store']:
-                    counts_1km['shopping'] += 1
-                elif leisure in ['park', 'playground', 'garden']:
-                    counts_1km['parks'] += 1
-        
-        # Process 2.5km POIs
-        if 'elements' in pois_2_5km_data:
-            logger.info(f"Processing {len(pois_2_5km_data['elements'])} 2.5km POI elements")
-            for element in pois_2_5km_data['elements']:
-                if element.get('type') != 'node':
-                    continue
-                
-                tags = element.get('tags', {})
-                amenity = tags.get('amenity', '')
-                public_transport = tags.get('public_transport', '')
-                railway = tags.get('railway', '')
-                aeroway = tags.get('aeroway', '')
-                
-                # Count POIs by category (no distance check needed since query already filtered)
-                if amenity == 'fuel':
-                    counts_2_5km['fuel_stations'] += 1
-                elif amenity == 'charging_station':
-                    counts_2_5km['ev_charging'] += 1
-                elif amenity in ['cinema', 'theatre']:
-                    counts_2_5km['entertainment'] += 1
-                elif (public_transport in ['station', 'stop_position'] or 
-                      railway == 'station' or 
-                      aeroway in ['aerodrome', 'terminal']):
-                    counts_2_5km['public_transport'] += 1
-        
-        logger.info(f"1km POI counts: {counts_1km}")
-        logger.info(f"2.5km POI counts: {counts_2_5km}")
-        
-        return self.calculate_locality_scores_from_counts_separate(counts_1km, counts_2_5km)
-
-    def calculate_locality_scores_from_counts_separate(self, counts_1km: Dict[str, int], 
-                                                     counts_2_5km: Dict[str, int]) -> Dict:
-        """Calculate locality scores based on POI counts from separate queries"""
-        features = self.get_empty_locality_features()
+        return np.bincount(np.array(ids, dtype=np.intp), minlength=n_categories)
+
+    def calculate_locality_scores_batch(self, counts: np.ndarray) -> List[Dict]:
+        """Calculate locality features for many hotels at once from an (N, 10) POI count array"""
+        count_columns = [column for column, _ in POI_COUNT_COLUMNS_1KM + POI_COUNT_COLUMNS_2_5KM]
+        columns = {column: counts[:, i] for i, column in enumerate(count_columns)}
         
         # Count-based scoring with increased ideal counts
-        features['hospital_score'] = self.calculate_category_score_by_count(
-            counts_1km['hospitals'], ideal_count=5, max_score=100
-        )
-        
-        features['pharmacy_score'] = self.calculate_category_score_by_count(
-            counts_1km['pharmacies'], ideal_count=8, max_score=100
-        )
-        
-        features['bank_score'] = self.calculate_category_score_by_count(
-            counts_1km['banks'], ideal_count=10, max_score=100
-        )
-        
-        features['restaurant_score'] = self.calculate_category_score_by_count(
-            counts_1km['restaurants'], ideal_count=25, max_score=100
-        )
-        
-        features['shopping_score'] = self.calculate_category_score_by_count(
-            counts_1km['shopping'], ideal_count=8, max_score=100
-        )
-        
-        features['green_space_score'] = self.calculate_category_score_by_count(
-            counts_1km['parks'], ideal_count=5, max_score=100
-        )
-        
-        features['entertainment_score'] = self.calculate_category_score_by_count(
-            counts_2_5km['entertainment'], ideal_count=5, max_score=100
-        )
-        
-        # Store all counts - ENSURE THESE ARE SAVED TO THE DATASET
-        features['hospitals_count_1km'] = counts_1km['hospitals']
-        features['pharmacies_count_1km'] = counts_1km['pharmacies']
-        features['banks_count_1km'] = counts_1km['banks']
-        features['restaurants_count_1km'] = counts_1km['restaurants']
-        features['shopping_count_1km'] = counts_1km['shopping']
-        features['parks_count_1km'] = counts_1km['parks']
-        features['fuel_stations_count_2_5km'] = counts_2_5km['fuel_stations']
-        features['ev_charging_count_2_5km'] = counts_2_5km['ev_charging']
-        features['entertainment_count_2_5km'] = counts_2_5km['entertainment']
-        features['transport_hubs_count_2_5km'] = counts_2_5km['public_transport']
+        for score_column, count_column, ideal_count in POI_SCORE_COLUMNS:
+            columns[score_column] = self.calculate_category_score_by_count(
+                columns[count_column], ideal_count=ideal_count, max_score=100
+            )
         
         # Calculate composite scores
-        features['walkability_score'] = min(100, int((
-            features['hospital_score'] * 0.2 +
-            features['pharmacy_score'] * 0.2 +
-            features['shopping_score'] * 0.25 +
-            features['restaurant_score'] * 0.2 +
-            features['bank_score'] * 0.15
-        )))
-        
-        features['locality_score'] = min(100, int((
-            features['walkability_score'] * 0.4 +
-            features['shopping_score'] * 0.15 +
-            features['restaurant_score'] * 0.15 +
-            features['entertainment_score'] * 0.15 +
-            features['green_space_score'] * 0.1 +
-            (counts_2_5km['fuel_stations'] * 2) +
-            (counts_2_5km['public_transport'] * 3)
-        )))
-        
-        logger.info(f"Calculated locality scores: walkability={features['walkability_score']}, locality={features['locality_score']}")
-        logger.info(f"Final POI counts - hospitals={counts_1km['hospitals']}, pharmacies={counts_1km['pharmacies']}, banks={counts_1km['banks']}, restaurants={counts_1km['restaurants']}, shopping={counts_1km['shopping']}, parks={counts_1km['parks']}")
-        
-        return features
+        columns['walkability_score'] = np.minimum(100, (
+            columns['hospital_score'] * 0.2 +
+            columns['pharmacy_score'] * 0.2 +
+            columns['shopping_score'] * 0.25 +
+            columns['restaurant_score'] * 0.2 +
+            columns['bank_score'] * 0.15
+        ).astype(np.int64))
+        
+        columns['locality_score'] = np.minimum(100, (
+            columns['walkability_score'] * 0.4 +
+            columns['shopping_score'] * 0.15 +
+            columns['restaurant_score'] * 0.15 +
+            columns['entertainment_score'] * 0.15 +
+            columns['green_space_score'] * 0.1 +
+            (columns['fuel_stations_count_2_5km'] * 2) +
+            (columns['transport_hubs_count_2_5km'] * 3)
+        ).astype(np.int64))
+        
+        # Back to one plain-int feature dict per hotel
+        column_values = {column: values.tolist() for column, values in columns.items()}
+        features_list = []
+        for i in range(len(counts)):
+            features = self.get_empty_locality_features()
+            for column in features:
+                features[column] = column_values[column][i]
+            features_list.append(features)
+        
+        return features_list
 
     def enrich_with_overpass(self, hotels: List[Dict], city: str) -> List[Dict]:
-        """Enrich hotel data with Overpass API POI data"""
+        """Enrich hotel data with Overpass API POI data using batched queries"""
         logger.info(f"Starting Overpass API enrichment for {len(hotels)} hotels in {city}")
         
-        enriched_hotels = []
-        successful_enrichments = 0
-        
+        # Hotels in the same ~100m grid cell share POI data: serve them from the cache,
+        # and query only one representative per uncached cell
+        overpass_by_idx = {}
+        cells = defaultdict(list)
         for idx, hotel in enumerate(hotels):
             lat = hotel.get('location', {}).get('latitude')
             lng = hotel.get('location', {}).get('longitude')
-            
-            if not lat or not lng:
+            if lat and lng:
+                cells[f"{round(lat, 3)}_{round(lng, 3)}_1000_2500"].append((idx, lat, lng))
+        
+        hotels_coords = []
+        cell_keys = {}
+        for cell_key, cell_hotels in cells.items():
+            cached = self.overpass_cache.get(cell_key)
+            if cached is not None:
+                for idx, _, _ in cell_hotels:
+                    overpass_by_idx[idx] = tuple(cached)
+            else:
+                hotels_coords.append(cell_hotels[0])
+                cell_keys[cell_hotels[0][0]] = cell_key
+        logger.info(f"Overpass cache: {len(cells) - len(hotels_coords)}/{len(cells)} locations served from cache")
+        
+        # Many hotels share one Overpass request, and chunks are fetched concurrently
+        chunks = self.chunk_hotels_for_overpass(hotels_coords)
+        if chunks:
+            workers = max(1, min(self.OVERPASS_MAX_WORKERS, len(chunks)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                chunk_results = list(executor.map(
+                    lambda chunk: self.query_overpass_pois_batch(chunk, city), chunks
+                ))
+            for chunk, (chunk_data, complete) in zip(chunks, chunk_results):
+                for (idx, _, _), overpass_data in zip(chunk, chunk_data):
+                    cell_key = cell_keys[idx]
+                    if complete:
+                        self.overpass_cache.set(cell_key, overpass_data)
+                    for cell_idx, _, _ in cells[cell_key]:
+                        overpass_by_idx[cell_idx] = overpass_data
+        
+        enriched_hotels = []
+        counted = []
+        
+        for idx, hotel in enumerate(hotels):
+            if idx not in overpass_by_idx:
                 logger.warning(f"Hotel {idx}: No coordinates available")
                 hotel.update(self.get_empty_locality_features())
                 enriched_hotels.append(hotel)
                 continue
             
             enriched_hotel = hotel.copy()
+            overpass_data = overpass_by_idx[idx]
             
-            try:
-                logger.info(f"Enriching hotel {idx + 1}/{len(hotels)} at coordinates {lat}, {lng}")
-                
-                # Query Overpass API for POIs around this hotel
-                overpass_data = self.query_overpass_pois(lat, lng, city, idx)
-                
-                if overpass_data and ('pois_1km' in overpass_data or 'pois_2_5km' in overpass_data):
-                    # Process POI data and calculate locality features
-                    locality_features = self.process_overpass_pois(overpass_data, lat, lng)
-                    
-                    # Add locality features to hotel data
-                    enriched_hotel.update(locality_features)
-                    
-                    if locality_features.get('locality_score', 0) > 0:
-                        successful_enrichments += 1
-                        logger.info(f"Hotel {idx}: Successfully enriched with locality score {locality_features.get('locality_score', 0)}")
-                    else:
-                        logger.warning(f"Hotel {idx}: Enrichment produced zero locality score")
-                else:
-                    logger.warning(f"Hotel {idx}: No POI data received from Overpass API")
+            if overpass_data is not None:
+                try:
+                    counted.append((idx, self.count_overpass_pois(*overpass_data)))
+                except Exception as e:
+                    logger.error(f"Overpass enrichment failed for hotel {idx}: {e}")
                     enriched_hotel.update(self.get_empty_locality_features())
-                
-            except Exception as e:
-                logger.error(f"Overpass enrichment failed for hotel {idx}: {e}")
+            else:
+                logger.warning(f"Hotel {idx}: No POI data received from Overpass API")
                 enriched_hotel.update(self.get_empty_locality_features())
             
             enriched_hotels.append(enriched_hotel)
-            
-            # Longer delay between requests to avoid rate limiting
-            if idx < len(hotels) - 1:  # Don't sleep after the last request
-                time.sleep(2)  # Increased delay to 2 seconds
+        
+        # Score every hotel with POI data in one vectorised pass
+        successful_enrichments = 0
+        if counted:
+            counts = np.array([row for _, row in counted], dtype=np.int64)
+            for (idx, _), locality_features in zip(counted, self.calculate_locality_scores_batch(counts)):
+                # Add locality features to hotel data
+                enriched_hotels[idx].update(locality_features)
+                
+                if locality_features['locality_score'] > 0:
+                    successful_enrichments += 1
+                    logger.info(f"Hotel {idx}: Successfully enriched with locality score {locality_features['locality_score']}")
+                else:
+                    logger.warning(f"Hotel {idx}: Enrichment produced zero locality score")
         
         logger.info(f"Overpass enrichment completed: {successful_enrichments}/{len(hotels)} hotels successfully enriched")
         
@@ -1138,27 +1464,23 @@ class HotelDataFetcher:
         enriched_file = city_dir / "hotels_enriched.json"
         try:
             with open(enriched_file, 'w') as f:
-                json.dump(enriched_hotels, f, indent=2)
+                json.dump(enriched_hotels, f, separators=(',', ':'))
         except Exception as e:
             logger.error(f"Failed to save enriched hotels: {e}")
         
         return enriched_hotels
 
-    def calculate_category_score_by_count(self, count: int, ideal_count: int, max_score: int) -> int:
-        """Calculate score for a POI category based on count only"""
-        if count == 0:
-            return 0
-        
+    def calculate_category_score_by_count(self, count: np.ndarray, ideal_count: int, max_score: int) -> np.ndarray:
+        """Calculate scores for a POI category based on count only, over an array of counts"""
         # Score based on count with diminishing returns after ideal count
-        if count <= ideal_count:
-            score_ratio = count / ideal_count
-        else:
-            # Diminishing returns after ideal count
-            excess = count - ideal_count
-            score_ratio = 1.0 + (excess / ideal_count) * 0.2  # 20% bonus for excess, diminishing
-            score_ratio = min(score_ratio, 1.3)  # Cap at 130% of base score
+        # (20% bonus for excess, capped at 130% of base score); zero counts score 0
+        score_ratio = np.where(
+            count <= ideal_count,
+            count / ideal_count,
+            np.minimum(1.0 + ((count - ideal_count) / ideal_count) * 0.2, 1.3)
+        )
         
-        return min(int(score_ratio * max_score), max_score)
+        return np.minimum((score_ratio * max_score).astype(np.int64), max_score)
 
     def get_empty_locality_features(self) -> Dict:
         """Return empty locality features structure"""
@@ -1191,13 +1513,15 @@ class HotelDataFetcher:
         processed_hotels = []
         hotel_reviews = []
         hotel_landmarks = []
+        # Hotel ids are the three-letter city prefix plus a running number
+        hotel_id_prefix = city_config.name[:3].lower()
         
         # Process each hotel
         for idx, hotel in enumerate(hotels):
-            hotel_id = f"{city_config.name.lower()[:3]}{str(idx+1).zfill(3)}"
+            hotel_id = f"{hotel_id_prefix}{str(idx+1).zfill(3)}"
             
             # Extract location
-            location = hotel.get('location', {})
+            location = hotel.get('location') or _EMPTY_DICT
             hotel_lat = location.get('latitude')
             hotel_lng = location.get('longitude')
             
@@ -1205,14 +1529,21 @@ class HotelDataFetcher:
                 logger.warning(f"Skipping hotel {idx} - missing coordinates")
                 continue
             
-            # Extract Google Maps links safely
+            # Extract Google Maps links and nested option objects once
             google_maps_links = hotel.get('googleMapsLinks', {})
+            display_name = hotel.get('displayName', '')
+            editorial_summary = hotel.get('editorialSummary', '')
+            accessibility_options = hotel.get('accessibilityOptions') or _EMPTY_DICT
+            payment_options = hotel.get('paymentOptions') or _EMPTY_DICT
+            parking_options = hotel.get('parkingOptions') or _EMPTY_DICT
+            ev_charge_options = hotel.get('evChargeOptions') or _EMPTY_DICT
+            fuel_options = hotel.get('fuelOptions')
             
             # Basic hotel information
             processed_hotel = {
                 'hotel_id': hotel_id,
                 'place_id': hotel.get('id', ''),
-                'display_name': hotel.get('displayName', {}).get('text', '') if isinstance(hotel.get('displayName'), dict) else str(hotel.get('displayName', '')),
+                'display_name': display_name.get('text', '') if isinstance(display_name, dict) else str(display_name),
                 'formatted_address': hotel.get('formattedAddress', ''),
                 'latitude': hotel_lat,
                 'longitude': hotel_lng,
@@ -1232,86 +1563,45 @@ class HotelDataFetcher:
                 'website_uri': hotel.get('websiteUri', ''),
                 'phone_number': hotel.get('nationalPhoneNumber', ''),
                 'international_phone': hotel.get('internationalPhoneNumber', ''),
-                'opening_hours': json.dumps(hotel.get('regularOpeningHours', {})) if hotel.get('regularOpeningHours') else None,
-                'types': json.dumps(hotel.get('types', [])),
-                'editorial_summary': hotel.get('editorialSummary', {}).get('text', '') if isinstance(hotel.get('editorialSummary'), dict) else hotel.get('editorialSummary', ''),
-                
-                # Atmosphere fields (Enterprise + Atmosphere SKU)
-                'serves_vegetarian_food': hotel.get('servesVegetarianFood'),
-                'serves_breakfast': hotel.get('servesBreakfast'),
-                'serves_lunch': hotel.get('servesLunch'),
-                'serves_dinner': hotel.get('servesDinner'),
-                'serves_brunch': hotel.get('servesBrunch'),
-                'serves_beer': hotel.get('servesBeer'),
-                'serves_wine': hotel.get('servesWine'),
-                'serves_cocktails': hotel.get('servesCocktails'),
-                'allows_dogs': hotel.get('allowsDogs'),
-                'good_for_children': hotel.get('goodForChildren'),
-                'good_for_groups': hotel.get('goodForGroups'),
-                'good_for_watching_sports': hotel.get('goodForWatchingSports'),
-                'live_music': hotel.get('liveMusic'),
-                'menu_for_children': hotel.get('menuForChildren'),
-                'outdoor_seating': hotel.get('outdoorSeating'),
-                'reservable': hotel.get('reservable'),
-                'delivery': hotel.get('delivery'),
-                'takeout': hotel.get('takeout'),
-                'curbside_pickup': hotel.get('curbsidePickup'),
-                'dine_in': hotel.get('dineIn'),
-                'restroom': hotel.get('restroom'),
-                
-                # Accessibility and payment options
-                'wheelchair_accessible_entrance': hotel.get('accessibilityOptions', {}).get('wheelchairAccessibleEntrance') if hotel.get('accessibilityOptions') else None,
-                'wheelchair_accessible_parking': hotel.get('accessibilityOptions', {}).get('wheelchairAccessibleParking') if hotel.get('accessibilityOptions') else None,
-                'accepts_credit_cards': hotel.get('paymentOptions', {}).get('acceptsCreditCards') if hotel.get('paymentOptions') else None,
-                'accepts_debit_cards': hotel.get('paymentOptions', {}).get('acceptsDebitCards') if hotel.get('paymentOptions') else None,
-                'accepts_cash_only': hotel.get('paymentOptions', {}).get('acceptsCashOnly') if hotel.get('paymentOptions') else None,
-                
-                # Parking options
-                'parking_free': hotel.get('parkingOptions', {}).get('freeParkingLot') if hotel.get('parkingOptions') else None,
-                'parking_paid': hotel.get('parkingOptions', {}).get('paidParking') if hotel.get('parkingOptions') else None,
-                'parking_street': hotel.get('parkingOptions', {}).get('freeStreetParking') if hotel.get('parkingOptions') else None,
-                'parking_garage': hotel.get('parkingOptions', {}).get('freeGarageParking') if hotel.get('parkingOptions') else None,
-                'valet_parking': hotel.get('parkingOptions', {}).get('valetParking') if hotel.get('parkingOptions') else None,
-                
-                # EV charging and fuel options
-                'ev_charging_available': hotel.get('evChargeOptions', {}).get('connectorCount', 0) > 0 if hotel.get('evChargeOptions') else False,
-                'fuel_options': json.dumps(hotel.get('fuelOptions', {})) if hotel.get('fuelOptions') else None,
-                
-                # Locality scores from Overpass enrichment
-                'walkability_score': hotel.get('walkability_score', 0),
-                'shopping_score': hotel.get('shopping_score', 0),
-                'restaurant_score': hotel.get('restaurant_score', 0),
-                'bank_score': hotel.get('bank_score', 0),
-                'green_space_score': hotel.get('green_space_score', 0),
-                'hospital_score': hotel.get('hospital_score', 0),
-                'pharmacy_score': hotel.get('pharmacy_score', 0),
-                'entertainment_score': hotel.get('entertainment_score', 0),
-                'locality_score': hotel.get('locality_score', 0),
-
-                #POI Counts
-                'hospitals_count_1km': hotel.get('hospitals_count_1km', 0),
-                'pharmacies_count_1km': hotel.get('pharmacies_count_1km', 0),
-                'banks_count_1km': hotel.get('banks_count_1km', 0),
-                'restaurants_count_1km': hotel.get('restaurants_count_1km', 0),
-                'shopping_count_1km': hotel.get('shopping_count_1km', 0),
-                'parks_count_1km': hotel.get('parks_count_1km', 0),
-                'fuel_stations_count_2_5km': hotel.get('fuel_stations_count_2_5km', 0),
-                'ev_charging_count_2_5km': hotel.get('ev_charging_count_2_5km', 0),
-                'entertainment_count_2_5km': hotel.get('entertainment_count_2_5km', 0),
-                'transport_hubs_count_2_5km': hotel.get('transport_hubs_count_2_5km', 0),
+                'opening_hours': hotel.get('regularOpeningHours') or None,
+                'types': hotel.get('types', []),
+                'editorial_summary': editorial_summary.get('text', '') if isinstance(editorial_summary, dict) else editorial_summary,
             }
             
+            # Atmosphere fields (Enterprise + Atmosphere SKU)
+            for column, source_field in HOTEL_ATMOSPHERE_FIELDS:
+                processed_hotel[column] = hotel.get(source_field)
+            
+            # Accessibility, payment and parking options
+            for column, source_field in HOTEL_ACCESSIBILITY_FIELDS:
+                processed_hotel[column] = accessibility_options.get(source_field)
+            for column, source_field in HOTEL_PAYMENT_FIELDS:
+                processed_hotel[column] = payment_options.get(source_field)
+            for column, source_field in HOTEL_PARKING_FIELDS:
+                processed_hotel[column] = parking_options.get(source_field)
+            
+            # EV charging and fuel options
+            processed_hotel['ev_charging_available'] = ev_charge_options.get('connectorCount', 0) > 0
+            processed_hotel['fuel_options'] = fuel_options or None
+            
+            # Locality scores and POI counts from Overpass enrichment
+            for column in HOTEL_LOCALITY_FIELDS:
+                processed_hotel[column] = hotel.get(column, 0)
+            
             processed_hotels.append(processed_hotel)
             
             # Process reviews if available
-            if hotel.get('reviews'):
-                for review_idx, review in enumerate(hotel['reviews'][:5]):
+            reviews = hotel.get('reviews')
+            if reviews:
+                for review_idx, review in enumerate(reviews[:5]):
+                    author_attribution = review.get('authorAttribution')
+                    review_text = review.get('text', '')
                     review_data = {
                         'hotel_id': hotel_id,
                         'review_id': f"{hotel_id}_r{review_idx+1}",
-                        'author_name': review.get('authorAttribution', {}).get('displayName', '') if isinstance(review.get('authorAttribution'), dict) else '',
+                        'author_name': author_attribution.get('displayName', '') if isinstance(author_attribution, dict) else '',
                         'rating': review.get('rating'),
-                        'text': review.get('text', {}).get('text', '') if isinstance(review.get('text'), dict) else review.get('text', ''),
+                        'text': review_text.get('text', '') if isinstance(review_text, dict) else review_text,
                         'publish_time': review.get('publishTime', ''),
                         'relative_time': review.get('relativePublishTimeDescription', ''),
                     }
@@ -1326,22 +1616,26 @@ class HotelDataFetcher:
 
     def get_route_matrix_batch(self, origins: List[Dict], destinations: List[Dict], 
                               city: str) -> Dict:
-        """Handle large route matrix requests by batching"""
+        """Handle large route matrix requests by sending origin batches concurrently"""
         all_results = []
-        batch_size = 25  # Conservative batch size to stay under 625 limit
-        
-        for i in range(0, len(origins), batch_size):
-            origin_batch = origins[i:i+batch_size]
-            result = self.get_route_matrix(origin_batch, destinations, city)
-            
+        # As many origins per batch as fit under the 625 element limit
+        batch_size = max(1, 625 // len(destinations))
+        offsets = range(0, len(origins), batch_size)
+        
+        # Each batch waits on the shared route_matrix token bucket, which keeps the combined rate in quota;
+        # executor.map returns results in batch order for the origin offset adjustment
+        workers = max(1, min(self.ROUTE_MATRIX_MAX_WORKERS, len(offsets)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda i: self.get_route_matrix(origins[i:i+batch_size], destinations, city), offsets
+            ))
+        
+        for i, result in zip(offsets, results):
             if result and 'matrix' in result:
-                # Adjust origin indices for batching
+                # Adjust origin indices for batching (a zero index is omitted from the response)
                 for element in result['matrix']:
-                    if 'originIndex' in element:
-                        element['originIndex'] += i
+                    element['originIndex'] = element.get('originIndex', 0) + i
                 all_results.extend(result['matrix'])
-            
-            time.sleep(0.1)  # Small delay between batches
         
         return {'matrix': all_results}
 
@@ -1349,84 +1643,109 @@ class HotelDataFetcher:
         """Calculate distances to landmarks using Routes API and fallback to straight-line distance"""
         hotel_landmarks = []
         
-        # Prepare origins (hotels) and destinations (landmarks)
+        landmark_coords = city_config.landmark_coords
+        landmark_keys = city_config.landmark_keys
+        
+        # Look up previously fetched routes keyed by rounded hotel position and landmark
+        route_keys = [
+            [f"{round(hotel['latitude'], 5)}_{round(hotel['longitude'], 5)}_{landmark_key}" for landmark_key in landmark_keys]
+            for hotel in hotels
+        ]
+        cached_routes = [[self.route_cache.get(key) for key in keys] for keys in route_keys]
+        uncached_hotels = [i for i, routes in enumerate(cached_routes) if any(route is None for route in routes)]
+        
+        # Prepare origins (hotels still missing a route) and destinations (landmarks)
         hotel_coords = []
-        for hotel in hotels:
+        for i in uncached_hotels:
+            hotel = hotels[i]
             hotel_coords.append({
                 'lat': hotel['latitude'],
                 'lng': hotel['longitude'],
                 'hotel_id': hotel['hotel_id']
             })
         
-        landmark_coords = []
-        landmarks_list = list(city_config.landmarks.items())
-        for landmark_key, landmark_data in landmarks_list:
-            landmark_coords.append({
-                'lat': landmark_data['lat'],
-                'lng': landmark_data['lng'],
-                'landmark_key': landmark_key,
-                'landmark_name': landmark_data['name']
-            })
-        
         # Try to get route matrix from Google Routes API
-        logger.info(f"Calculating route matrix for {len(hotel_coords)} hotels to {len(landmark_coords)} landmarks")
-        route_data = self.get_route_matrix(hotel_coords, landmark_coords, city_config.name)
+        route_data = None
+        if hotel_coords:
+            logger.info(f"Calculating route matrix for {len(hotel_coords)} hotels to {len(landmark_coords)} landmarks "
+                        f"({len(hotels) - len(hotel_coords)} served from route cache)")
+            route_data = self.get_route_matrix(hotel_coords, landmark_coords, city_config.name)
+        else:
+            logger.info(f"All {len(hotels)} hotels served from route cache")
+        
+        # Index route matrix elements by (hotel, destination) once; the API omits zero-valued indices
+        matrix_idx = {}
+        if route_data and route_data.get('matrix'):
+            matrix_idx = {
+                (uncached_hotels[element.get('originIndex', 0)], element.get('destinationIndex', 0)): element
+                for element in route_data['matrix']
+            }
+        new_routes = {}
+        
+        # Straight-line fallback distances for the whole (hotels, landmarks) grid in one vectorised call
+        hotel_points = np.radians(
+            np.array([(hotel['latitude'], hotel['longitude']) for hotel in hotels], dtype=np.float64).reshape(-1, 2)
+        )
+        straight_line_km = haversine_rad(
+            hotel_points[:, 0, None], hotel_points[:, 1, None],
+            city_config.landmarks_lat_rad[None, :], city_config.landmarks_lng_rad[None, :],
+            city_config.landmarks_cos_lat[None, :]
+        )
         
         # Process route matrix results or fall back to straight-line distance
         for hotel_idx, hotel in enumerate(hotels):
             hotel_id = hotel['hotel_id']
-            hotel_lat = hotel['latitude']
-            hotel_lng = hotel['longitude']
             
-            for landmark_idx, (landmark_key, landmark_data) in enumerate(landmarks_list):
-                landmark_name = landmark_data['name']
-                landmark_lat = landmark_data['lat']
-                landmark_lng = landmark_data['lng']
-                
+            for landmark_idx, (landmark_key, landmark_name) in enumerate(zip(landmark_keys, city_config.landmark_names)):
                 # Try to find route data
                 distance_km = None
                 travel_time_minutes = None
                 traffic_aware = False
                 
-                if route_data and 'matrix' in route_data and route_data['matrix']:
-                    # Look for matching element in route matrix
-                    for element in route_data['matrix']:
-                        if (element.get('originIndex') == hotel_idx and 
-                            element.get('destinationIndex') == landmark_idx):
+                # Reuse a cached route, otherwise look for matching element in route matrix
+                cached = cached_routes[hotel_idx][landmark_idx]
+                element = matrix_idx.get((hotel_idx, landmark_idx)) if cached is None else None
+                if cached is not None:
+                    distance_km, travel_time_minutes = cached
+                    traffic_aware = travel_time_minutes is not None
+                elif element is not None:
+                    status = element.get('status', {})
+                    if isinstance(status, dict):
+                        # An omitted code is the default 0 (OK)
+                        status_code = status.get('code', 0)
+                    else:
+                        status_code = status
+                    
+                    if status_code == 'OK' or status_code == 0:
+                        distance_meters = element.get('distanceMeters', 0)
+                        if distance_meters > 0:
+                            distance_km = distance_meters / 1000
                             
-                            status = element.get('status', {})
-                            if isinstance(status, dict):
-                                status_code = status.get('code')
+                            duration_data = element.get('duration', {})
+                            if isinstance(duration_data, dict):
+                                duration_seconds = duration_data.get('seconds', 0)
+                            elif isinstance(duration_data, str) and duration_data.endswith('s'):
+                                try:
+                                    duration_seconds = int(duration_data[:-1])
+                                except ValueError:
+                                    duration_seconds = 0
                             else:
-                                status_code = status
+                                duration_seconds = 0
                             
-                            if status_code == 'OK' or status_code == 0:
-                                distance_meters = element.get('distanceMeters', 0)
-                                if diestance_meters > 0:
-                                    distance_km = distance_meters / 1000
-                                    
-                                    duration_data = element.get('duration', {})
-                                    if isinstance(duration_data, dict):
-                                        duration_seconds = duration_data.get('seconds', 0)
-                                    elif isinstance(duration_data, str) and duration_data.endswith('s'):
-                                        try:
-                                            duration_seconds = int(duration_data[:-1])
-                                        except ValueError:
-                                            duration_seconds = 0
-                                    else:
-                                        duration_seconds = 0
-                                    
-                                    if duration_seconds > 0:
-                                        travel_time_minutes = duration_seconds / 60
-                                        traffic_aware = True
-                                        logger.debug(f"Routes API: {hotel_id} to {landmark_key}: {distance_km:.2f}km, {travel_time_minutes:.1f}min")
-                                        break
+                            if duration_seconds > 0:
+                                travel_time_minutes = duration_seconds / 60
+                                traffic_aware = True
+                                logger.debug("Routes API: %s to %s: %.2fkm, %.1fmin",
+                                             hotel_id, landmark_key, distance_km, travel_time_minutes)
+                            
+                            new_routes[route_keys[hotel_idx][landmark_idx]] = [distance_km, travel_time_minutes]
                 
                 # Fallback to straight-line distance if no route data
                 if distance_km is None:
-                    distance_km = self.calculate_distance(hotel_lat, hotel_lng, landmark_lat, landmark_lng)
+                    distance_km = float(straight_line_km[hotel_idx, landmark_idx])
                     traffic_aware = False
-                    logger.debug(f"Straight-line: {hotel_id} to {landmark_key}: {distance_km:.2f}km")
+                    # Lazy %-formatting: this runs for every hotel-landmark pair but is only logged at DEBUG
+                    logger.debug("Straight-line: %s to %s: %.2fkm", hotel_id, landmark_key, distance_km)
                 
                 hotel_landmarks.append({
                     'hotel_id': hotel_id,
@@ -1437,35 +1756,42 @@ class HotelDataFetcher:
                     'traffic_aware': traffic_aware
                 })
         
+        self.route_cache.set_many(new_routes)
         logger.info(f"Generated {len(hotel_landmarks)} hotel-landmark combinations")
         return hotel_landmarks
 
     def safe_request(self, url: str, params: dict = None, timeout: int = 60, max_retries: int = 5) -> Optional[requests.Response]:
         """Enhanced safe HTTP request with multiple retry attempts"""
+        backoff = 1.0
+        retry_after = None
         for attempt in range(max_retries):
             try:
-                self.rotate_headers()
+                headers = self.rotate_headers()
                 
-                # Progressive delay between attempts
+                # Decorrelated jitter backoff (capped at 30 seconds) spreads out retries from concurrent
+                # workers; a server supplied Retry-After is honoured as is
                 if attempt > 0:
-                    delay = min(random.uniform(3, 8) * (attempt + 1), 30)  # Cap at 30 seconds
+                    if retry_after is not None:
+                        delay = retry_after
+                    else:
+                        delay = backoff = min(30.0, random.uniform(1.0, backoff * 3))
+                    retry_after = None
                     logger.info(f"Retry attempt {attempt + 1} for Overpass API, waiting {delay:.1f} seconds")
                     time.sleep(delay)
-                else:
-                    time.sleep(random.uniform(1, 3))  # Initial delay
                 
-                response = self.session.get(url, params=params, timeout=timeout)
+                # Pace every attempt through the shared Overpass rate limiter
+                self.buckets['overpass'].consume()
+                
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout)
                 
                 if response.status_code == 200:
                     logger.debug(f"Successfully fetched {url} (attempt {attempt + 1})")
                     return response
-                elif response.status_code == 429:  # Rate limited
-                    wait_time = min(60, 10 * (attempt + 1))
-                    logger.warning(f"Overpass API rate limited, waiting {wait_time} seconds")
-                    time.sleep(wait_time)
+                if response.status_code == 429:  # Rate limited
+                    retry_after = self.parse_retry_after(response)
+                    logger.warning(f"Overpass API rate limited on attempt {attempt + 1}")
                 elif response.status_code == 504:  # Gateway timeout
                     logger.warning(f"Overpass API gateway timeout on attempt {attempt + 1}")
-                    time.sleep(10)
                 else:
                     response.raise_for_status()
                 
@@ -1494,45 +1820,52 @@ class HotelDataFetcher:
     def save_datasets(self, city: str, hotels: List[Dict], reviews: List[Dict], 
                      landmarks: List[Dict], locality_data: List[Dict] = None):
         """Save all datasets to CSV files"""
-        output_dir = self.OUTPUT_DIR / city / "datasets"
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = self._ensure_dir(self.OUTPUT_DIR / city / "datasets")
         
         # Save hotels dataset
         if hotels:
             hotels_file = output_dir / f"{city.lower()}_hotels.csv"
-            with open(hotels_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=hotels[0].keys())
-                writer.writeheader()
-                writer.writerows(hotels)
+            self.write_dataset(hotels_file, self.encode_json_columns(hotels, HOTEL_JSON_COLUMNS), hotels[0].keys())
             logger.info(f"Saved {len(hotels)} hotels to {hotels_file}")
         
         # Save reviews dataset
         if reviews:
             reviews_file = output_dir / f"{city.lower()}_reviews.csv"
-            with open(reviews_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=reviews[0].keys())
-                writer.writeheader()
-                writer.writerows(reviews)
+            self.write_dataset(reviews_file, reviews, reviews[0].keys())
             logger.info(f"Saved {len(reviews)} reviews to {reviews_file}")
         
         # Save landmarks dataset
         if landmarks:
             landmarks_file = output_dir / f"{city.lower()}_hotel_landmarks.csv"
-            with open(landmarks_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=landmarks[0].keys())
-                writer.writeheader()
-                writer.writerows(landmarks)
+            self.write_dataset(landmarks_file, landmarks, landmarks[0].keys())
             logger.info(f"Saved {len(landmarks)} hotel-landmarks to {landmarks_file}")
         
         # Save locality dataset
         if locality_data:
             locality_file = output_dir / f"{city.lower()}_locality.csv"
-            with open(locality_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=locality_data[0].keys())
-                writer.writeheader()
-                writer.writerows(locality_data)
+            self.write_dataset(locality_file, locality_data, locality_data[0].keys())
             logger.info(f"Saved {len(locality_data)} locality records to {locality_file}")
 
+    def write_dataset(self, file_path: Path, rows: Iterable[Dict], fieldnames: Iterable[str]):
+        """Write a dataset CSV, plus a Parquet copy next to it when DATASET_FORMAT is parquet"""
+        if self.DATASET_FORMAT != 'parquet':
+            self.write_csv(file_path, rows, fieldnames)
+            return
+        rows = list(rows)
+        fieldnames = list(fieldnames)
+        self.write_csv(file_path, rows, fieldnames)
+        table = pa.Table.from_pylist(rows).select(fieldnames)
+        pq.write_table(table, file_path.with_suffix('.parquet'), compression='zstd')
+
+    def encode_json_columns(self, rows: List[Dict], columns: Tuple[str, ...]):
+        """Yield copies of rows with the nested values in columns serialised as JSON strings"""
+        for row in rows:
+            encoded = row.copy()
+            for column in columns:
+                if encoded.get(column) is not None:
+                    encoded[column] = json.dumps(encoded[column])
+            yield encoded
+
     def create_locality_dataset(self, hotels: List[Dict]) -> List[Dict]:
         """Create locality dataset from enriched hotel data"""
         locality_data = []
@@ -1545,39 +1878,19 @@ class HotelDataFetcher:
                 'latitude': hotel['latitude'],
                 'longitude': hotel['longitude'],
                 'formatted_address': hotel['formatted_address'],
-                
-                # POI counts within specific radii
-                'hospitals_count_1km': hotel.get('hospitals_count_1km', 0),
-                'pharmacies_count_1km': hotel.get('pharmacies_count_1km', 0),
-                'shopping_count_1km': hotel.get('shopping_count_1km', 0),
-                'restaurants_count_1km': hotel.get('restaurants_count_1km', 0),
-                'banks_count_1km': hotel.get('banks_count_1km', 0),
-                'parks_count_1km': hotel.get('parks_count_1km', 0),
-                'fuel_stations_count_2_5km': hotel.get('fuel_stations_count_2_5km', 0),
-                'ev_charging_count_2_5km': hotel.get('ev_charging_count_2_5km', 0),
-                'entertainment_count_2_5km': hotel.get('entertainment_count_2_5km', 0),
-                'transport_hubs_count_2_5km': hotel.get('transport_hubs_count_2_5km', 0),
-                
-                # Locality scores
-                'walkability_score': hotel.get('walkability_score', 0),
-                'shopping_score': hotel.get('shopping_score', 0),
-                'restaurant_score': hotel.get('restaurant_score', 0),
-                'bank_score': hotel.get('bank_score', 0),
-                'green_space_score': hotel.get('green_space_score', 0),
-                'hospital_score': hotel.get('hospital_score', 0),
-                'pharmacy_score': hotel.get('pharmacy_score', 0),
-                'entertainment_score': hotel.get('entertainment_score', 0),
-                'locality_score': hotel.get('locality_score', 0)
             }
             
+            # POI counts within specific radii and locality scores
+            for column in LOCALITY_DATASET_FIELDS:
+                locality_record[column] = hotel.get(column, 0)
+            
             locality_data.append(locality_record)
         
         return locality_data
 
     def save_mappings(self, city: str, hotels: List[Dict]):
         """Save ID mappings for reference"""
-        mappings_dir = self.OUTPUT_DIR / city / "mappings"
-        mappings_dir.mkdir(parents=True, exist_ok=True)
+        mappings_dir = self._ensure_dir(self.OUTPUT_DIR / city / "mappings")
         
         # Create hotel ID mapping
         hotel_mapping = []
@@ -1592,14 +1905,12 @@ class HotelDataFetcher:
         
         mapping_file = mappings_dir / f"{city.lower()}_hotel_mapping.csv"
         if hotel_mapping:
-            with open(mapping_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=hotel_mapping[0].keys())
-                writer.writeheader()
-                writer.writerows(hotel_mapping)
+            self.write_csv(mapping_file, hotel_mapping, hotel_mapping[0].keys())
             logger.info(f"Saved hotel mappings to {mapping_file}")
 
     def generate_report(self, city: str, hotels: List[Dict], reviews: List[Dict], landmarks: List[Dict]):
         """Generate comprehensive data quality and usage report"""
+        stats = self._compute_hotel_stats(hotels)
         report = {
             'city': city,
             'generated_at': datetime.now().isoformat(),
@@ -1610,66 +1921,104 @@ class HotelDataFetcher:
                 'unique_place_ids': len(set(h.get('place_id', '') for h in hotels if h.get('place_id')))
             },
             'api_usage': dict(self.request_counts),
-            'data_quality': self.analyze_data_quality(hotels),
-            'field_completeness': self.analyze_field_completeness(hotels),
-            'locality_analysis': self.analyze_locality_coverage(hotels)
+            'data_quality': self.analyze_data_quality(hotels, stats),
+            'field_completeness': self.analyze_field_completeness(hotels, stats),
+            'locality_analysis': self.analyze_locality_coverage(hotels, stats)
         }
         
         # Save JSON report
-        reports_dir = self.OUTPUT_DIR / city / "reports"
-        reports_dir.mkdir(parents=True, exist_ok=True)
+        reports_dir = self._ensure_dir(self.OUTPUT_DIR / city / "reports")
         
         json_report = reports_dir / f"{city.lower()}_report.json"
+        # Encode in one go and hand the file a single write instead of json.dump's many small chunks
         with open(json_report, 'w') as f:
-            json.dump(report, f, indent=2)
+            f.write(json.dumps(report, indent=2))
         
         logger.info(f"Generated report for {city}: {report['data_summary']}")
         return report
 
-    def analyze_data_quality(self, hotels: List[Dict]) -> Dict:
+    def _compute_hotel_stats(self, hotels: List[Dict]) -> Dict:
+        """Aggregate rating, field completeness and locality stats in a single pass over hotels"""
+        rating_sum = 0
+        rating_count = 0
+        min_rating = None
+        max_rating = None
+        non_null_counts = dict.fromkeys(REPORT_COMPLETENESS_FIELDS, 0)
+        locality_sum = 0
+        enriched_count = 0
+        
+        for hotel in hotels:
+            rating = hotel.get('rating')
+            if rating is not None:
+                rating_sum += rating
+                rating_count += 1
+                if min_rating is None or rating < min_rating:
+                    min_rating = rating
+                if max_rating is None or rating > max_rating:
+                    max_rating = rating
+            
+            for field in REPORT_COMPLETENESS_FIELDS:
+                if hotel.get(field) not in (None, ''):
+                    non_null_counts[field] += 1
+            
+            locality_score = hotel.get('locality_score', 0)
+            locality_sum += locality_score
+            if locality_score > 0:
+                enriched_count += 1
+        
+        return {
+            'rating_sum': rating_sum,
+            'rating_count': rating_count,
+            'min_rating': min_rating,
+            'max_rating': max_rating,
+            'non_null_counts': non_null_counts,
+            'locality_sum': locality_sum,
+            'enriched_count': enriched_count
+        }
+
+    def analyze_data_quality(self, hotels: List[Dict], stats: Dict = None) -> Dict:
         """Analyze data quality metrics"""
         if not hotels:
             return {}
+        stats = stats or self._compute_hotel_stats(hotels)
         
         # Rating distribution
-        ratings = [h.get('rating') for h in hotels if h.get('rating') is not None]
+        rating_count = stats['rating_count']
         rating_stats = {
-            'avg_rating': round(sum(ratings) / len(ratings), 2) if ratings else None,
-            'min_rating': min(ratings) if ratings else None,
-            'max_rating': max(ratings) if ratings else None,
-            'rating_count': len(ratings)
+            'avg_rating': round(stats['rating_sum'] / rating_count, 2) if rating_count else None,
+            'min_rating': stats['min_rating'],
+            'max_rating': stats['max_rating'],
+            'rating_count': rating_count
         }
         
         return {'rating_stats': rating_stats}
 
-    def analyze_field_completeness(self, hotels: List[Dict]) -> Dict:
+    def analyze_field_completeness(self, hotels: List[Dict], stats: Dict = None) -> Dict:
         """Analyze field completeness percentages"""
         if not hotels:
             return {}
+        stats = stats or self._compute_hotel_stats(hotels)
         
         total_hotels = len(hotels)
-        key_fields = ['rating', 'user_rating_count', 'phone_number', 'website_uri']
-        
         field_completeness = {}
-        for field in key_fields:
-            non_null_count = sum(1 for hotel in hotels if hotel.get(field) is not None and hotel.get(field) != '')
+        for field, non_null_count in stats['non_null_counts'].items():
             completeness = round((non_null_count / total_hotels) * 100, 1)
             field_completeness[field] = f"{completeness}%"
         
         return field_completeness
 
-    def analyze_locality_coverage(self, hotels: List[Dict]) -> Dict:
+    def analyze_locality_coverage(self, hotels: List[Dict], stats: Dict = None) -> Dict:
         """Analyze locality feature coverage"""
         if not hotels:
             return {}
+        stats = stats or self._compute_hotel_stats(hotels)
         
         total_hotels = len(hotels)
-        locality_scores = [h.get('locality_score', 0) for h in hotels]
-        avg_locality_score = round(sum(locality_scores) / len(locality_scores), 1) if locality_scores else 0
+        avg_locality_score = round(stats['locality_sum'] / total_hotels, 1)
         
         return {
             'avg_locality_score': avg_locality_score,
-            'overpass_enrichment_success': f"{sum(1 for h in hotels if h.get('locality_score', 0) > 0) / total_hotels * 100:.1f}%"
+            'overpass_enrichment_success': f"{stats['enriched_count'] / total_hotels * 100:.1f}%"
         }
 
     def process_city(self, city_name: str, max_hotels: int = 250):
@@ -1724,26 +2073,50 @@ class HotelDataFetcher:
         except Exception as e:
             logger.error(f"Critical error processing {city_name}: {e}")
             raise
+        finally:
+            self.close_raw_handles(city_name)
 
-    def run_all_cities(self):
+    def run_all_cities(self, workers: int = 1):
         """Run data collection for all cities and create consolidated All India datasets"""
         city_configs = self.get_city_config()
         
         # Track successful cities for consolidation
         successful_cities = []
         
-        for city_name in city_configs.keys():
-            try:
-                logger.info(f"Processing {city_name}...")
-                self.process_city(city_name, self.DEFAULT_PER_CITY)
-                successful_cities.append(city_name)
-                logger.info(f"Successfully completed {city_name}")
-            except Exception as e:
-                logger.error(f"Failed to process {city_name}: {e}")
-                continue
+        if workers > 1:
+            # Cities are independent, so fan them out across processes
+            max_workers = min(workers, len(city_configs), os.cpu_count() or 1)
+            logger.info(f"Processing {len(city_configs)} cities with {max_workers} worker processes")
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_city_worker,
+                                     initargs=(max_workers, self.DATASET_FORMAT)) as executor:
+                futures = {
+                    executor.submit(_process_city_worker, city_name, self.DEFAULT_PER_CITY): city_name
+                    for city_name in city_configs
+                }
+                
+                # Collect cities as they finish rather than in submission order
+                for future in as_completed(futures):
+                    city_name = futures[future]
+                    try:
+                        worker_counts = future.result()
+                        for api_type, count in worker_counts.items():
+                            self.request_counts[api_type] += count
+                        successful_cities.append(city_name)
+                        logger.info(f"Successfully completed {city_name}")
+                    except Exception as e:
+                        logger.error(f"Failed to process {city_name}: {e}")
             
-            # Brief pause between cities
-            time.sleep(2)
+            # Consolidate in config order regardless of completion order
+            successful_cities = [city_name for city_name in city_configs if city_name in successful_cities]
+        else:
+            for city_name in city_configs.keys():
+                try:
+                    logger.info(f"Processing {city_name}...")
+                    self.process_city(city_name, self.DEFAULT_PER_CITY)
+                    successful_cities.append(city_name)
+                    logger.info(f"Successfully completed {city_name}")
+                except Exception as e:
+                    logger.error(f"Failed to process {city_name}: {e}")
         
         # Create consolidated All India datasets
         if successful_cities:
@@ -1756,93 +2129,105 @@ class HotelDataFetcher:
         """Create consolidated All India datasets from all processed cities"""
         logger.info(f"Consolidating datasets from {len(cities)} cities: {', '.join(cities)}")
         
-        # Initialize consolidated data structures
-        all_hotels = []
-        all_reviews = []
-        all_landmarks = []
-        all_localities = []
+        all_india_dir = self._ensure_dir(self.OUTPUT_DIR / "All_India" / "datasets")
         
-        # Collect data from each city
-        for city in cities:
+        for suffix, label in ALL_INDIA_DATASETS:
+            sources = []
+            for city in cities:
+                city_file = self.OUTPUT_DIR / city / "datasets" / f"{city.lower()}_{suffix}.csv"
+                if city_file.exists():
+                    sources.append(city_file)
+                    logger.info(f"Added {label} from {city}")
+            
+            if not sources:
+                continue
+            
+            target = all_india_dir / f"all_india_{suffix}.csv"
             try:
-                city_datasets_dir = self.OUTPUT_DIR / city / "datasets"
-                
-                # Load city hotels
-                hotels_file = city_datasets_dir / f"{city.lower()}_hotels.csv"
-                if hotels_file.exists():
-                    hotels_data = self.load_csv_data(hotels_file)
-                    all_hotels.extend(hotels_data)
-                    logger.info(f"Added {len(hotels_data)} hotels from {city}")
-                
-                # Load city reviews
-                reviews_file = city_datasets_dir / f"{city.lower()}_reviews.csv"
-                if reviews_file.exists():
-                    reviews_data = self.load_csv_data(reviews_file)
-                    all_reviews.extend(reviews_data)
-                    logger.info(f"Added {len(reviews_data)} reviews from {city}")
-                
-                # Load city landmarks
-                landmarks_file = city_datasets_dir / f"{city.lower()}_hotel_landmarks.csv"
-                if landmarks_file.exists():
-                    landmarks_data = self.load_csv_data(landmarks_file)
-                    all_landmarks.extend(landmarks_data)
-                    logger.info(f"Added {len(landmarks_data)} landmarks from {city}")
-                
-                # Load city localities
-                locality_file = city_datasets_dir / f"{city.lower()}_locality.csv"
-                if locality_file.exists():
-                    locality_data = self.load_csv_data(locality_file)
-                    all_localities.extend(locality_data)
-                    logger.info(f"Added {len(locality_data)} localities from {city}")
-                    
+                # Append each city's CSV body as raw bytes when every file shares the same header
+                if not self.concat_csv_files(sources, target):
+                    logger.warning(f"City {label} CSVs have differing headers, re-encoding {target.name}")
+                    self.merge_csv_files(sources, target)
             except Exception as e:
-                logger.error(f"Failed to load data from {city}: {e}")
+                logger.error(f"Failed to consolidate {label}: {e}")
                 continue
-        
-        # Save consolidated datasets
-        all_india_dir = self.OUTPUT_DIR / "All_India" / "datasets"
-        all_india_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save All India Hotels dataset
-        if all_hotels:
-            hotels_file = all_india_dir / "all_india_hotels.csv"
-            self.save_csv_data(hotels_file, all_hotels)
-            logger.info(f"Saved {len(all_hotels)} hotels to All India dataset")
-        
-        # Save All India Reviews dataset
-        if all_reviews:
-            reviews_file = all_india_dir / "all_india_reviews.csv"
-            self.save_csv_data(reviews_file, all_reviews)
-            logger.info(f"Saved {len(all_reviews)} reviews to All India dataset")
-        
-        # Save All India Landmarks dataset
-        if all_landmarks:
-            landmarks_file = all_india_dir / "all_india_hotel_landmarks.csv"
-            self.save_csv_data(landmarks_file, all_landmarks)
-            logger.info(f"Saved {len(all_landmarks)} landmarks to All India dataset")
-        
-        # Save All India Localities dataset
-        if all_localities:
-            localities_file = all_india_dir / "all_india_locality.csv"
-            self.save_csv_data(localities_file, all_localities)
-            logger.info(f"Saved {len(all_localities)} localities to All India dataset")
+            
+            logger.info(f"Saved {label} to All India dataset {target.name}")
+            
+            if self.DATASET_FORMAT == 'parquet':
+                try:
+                    self.concat_parquet_files(sources, target.with_suffix('.parquet'))
+                except Exception as e:
+                    logger.error(f"Failed to consolidate {label} Parquet files: {e}")
         
         # Generate All India summary report
-        self.generate_all_india_report(cities, all_hotels, all_reviews, all_landmarks, all_localities)
+        self.generate_all_india_report(cities)
         
         logger.info("Successfully created All India consolidated datasets")
 
+    def concat_parquet_files(self, sources: List[Path], target: Path):
+        """Concatenate the Parquet copies of the city dataset CSVs in sources into target"""
+        tables = [pq.read_table(path.with_suffix('.parquet')) for path in sources
+                  if path.with_suffix('.parquet').exists()]
+        if tables:
+            # Columns that are all-null in one city are promoted to the type seen elsewhere
+            pq.write_table(pa.concat_tables(tables, promote_options='default'), target, compression='zstd')
+
+    def concat_csv_files(self, sources: List[Path], target: Path) -> bool:
+        """Concatenate CSV files byte-for-byte under one header; returns False if the headers differ"""
+        with open(sources[0], 'rb') as src:
+            header = src.readline()
+        for path in sources[1:]:
+            with open(path, 'rb') as src:
+                if src.readline() != header:
+                    return False
+        
+        with open(target, 'wb') as dst:
+            dst.write(header)
+            for path in sources:
+                with open(path, 'rb') as src:
+                    src.readline()
+                    shutil.copyfileobj(src, dst, 1 << 20)
+        return True
+
+    def merge_csv_files(self, sources: List[Path], target: Path):
+        """Merge CSV files with differing headers into one file over the union of their columns, row by row"""
+        fieldnames = {}
+        for path in sources:
+            with open(path, 'r', newline='', encoding='utf-8') as f:
+                fieldnames.update(dict.fromkeys(next(csv.reader(f), [])))
+        
+        # Rows stream straight from each source into the writer; only one row is held at a time
+        rows = (
+            {field: row.get(field, '') for field in fieldnames}
+            for path in sources for row in self.iter_csv_data(path)
+        )
+        self.write_csv(target, rows, fieldnames)
+
+    def iter_csv_data(self, file_path: Path) -> Iterator[Dict]:
+        """Yield the rows of a CSV file one at a time"""
+        with open(file_path, 'r', newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+
     def load_csv_data(self, file_path: Path) -> List[Dict]:
         """Load data from CSV file"""
         data = []
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                data = list(reader)
+            data = list(self.iter_csv_data(file_path))
         except Exception as e:
             logger.error(f"Failed to load CSV data from {file_path}: {e}")
         return data
 
+    def write_csv(self, file_path: Path, rows: Iterable[Dict], fieldnames: Iterable[str]):
+        """Write dict rows (each holding every field) to a CSV file through one large write buffer"""
+        fieldnames = tuple(fieldnames)
+        # itemgetter pulls a whole row in one C call; with a single field it returns a bare value
+        get_row = itemgetter(*fieldnames) if len(fieldnames) > 1 else lambda row: (row[fieldnames[0]],)
+        with open(file_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(map(get_row, rows))
+
     def save_csv_data(self, file_path: Path, data: List[Dict]):
         """Save data to CSV file"""
         if not data:
@@ -1850,54 +2235,136 @@ class HotelDataFetcher:
             return
         
         try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=data[0].keys())
-                writer.writeheader()
-                writer.writerows(data)
+            self.write_csv(file_path, data, data[0].keys())
         except Exception as e:
             logger.error(f"Failed to save CSV data to {file_path}: {e}")
 
-    def generate_all_india_report(self, cities: List[str], hotels: List[Dict], 
-                                 reviews: List[Dict], landmarks: List[Dict], 
-                                 localities: List[Dict]):
+    @staticmethod
+    def count_by_hotel_prefix(records: Iterable[Dict]) -> Counter:
+        """Count records per three-letter city prefix of their hotel_id"""
+        # Count per hotel in C first, so the prefix slice happens once per hotel rather than once per record
+        by_prefix = Counter()
+        for hotel_id, count in Counter(map(itemgetter('hotel_id'), records)).items():
+            by_prefix[hotel_id[:3]] += count
+        return by_prefix
+
+    def aggregate_city_report_stats(self, city: str) -> Dict[str, Counter]:
+        """Stream one city's dataset CSVs into the partial counts and sums behind the All India report"""
+        stats = {
+            'hotels_by_city': Counter(),
+            'localities_by_city': Counter(),
+            'reviews_by_prefix': Counter(),
+            'landmarks_by_prefix': Counter(),
+            'totals': Counter()
+        }
+        totals = stats['totals']
+        datasets_dir = self.OUTPUT_DIR / city / "datasets"
+        city_key = city.lower()
+        
+        # Hotels: rows are bucketed by their city column; numeric columns are gathered per city and
+        # parsed by numpy, so only counters outlive this city
+        hotels_file = datasets_dir / f"{city_key}_hotels.csv"
+        if hotels_file.exists():
+            ratings = []
+            for h in self.iter_csv_data(hotels_file):
+                stats['hotels_by_city'][h.get('city')] += 1
+                rating = h.get('rating')
+                if rating:
+                    ratings.append(rating)
+                if h.get('phone_number'):
+                    totals['hotels_with_phone'] += 1
+                if h.get('website_uri'):
+                    totals['hotels_with_website'] += 1
+            ratings = parse_float_array(ratings, 'rating')
+            totals['hotels_with_ratings'] += ratings.size
+            totals['rating_sum'] += float(ratings.sum())
+        
+        # Reviews and landmarks are attributed to cities by the prefix of their hotel_id
+        reviews_file = datasets_dir / f"{city_key}_reviews.csv"
+        if reviews_file.exists():
+            stats['reviews_by_prefix'].update(self.count_by_hotel_prefix(self.iter_csv_data(reviews_file)))
+        
+        landmarks_file = datasets_dir / f"{city_key}_hotel_landmarks.csv"
+        if landmarks_file.exists():
+            stats['landmarks_by_prefix'].update(self.count_by_hotel_prefix(self.iter_csv_data(landmarks_file)))
+            totals['landmarks_with_travel_time'] += sum(
+                1 for l in self.iter_csv_data(landmarks_file) if l.get('travel_time_minutes')
+            )
+        
+        locality_file = datasets_dir / f"{city_key}_locality.csv"
+        if locality_file.exists():
+            locality_scores = []
+            walkability_scores = []
+            for loc in self.iter_csv_data(locality_file):
+                stats['localities_by_city'][loc.get('city')] += 1
+                locality_score = loc.get('locality_score')
+                if locality_score:
+                    locality_scores.append(locality_score)
+                walkability_score = loc.get('walkability_score')
+                if walkability_score:
+                    walkability_scores.append(walkability_score)
+            locality_scores = parse_float_array(locality_scores, 'locality_score')
+            walkability_scores = parse_float_array(walkability_scores, 'walkability_score')
+            totals['locality_score_sum'] += float(locality_scores.sum())
+            totals['locality_score_count'] += locality_scores.size
+            totals['localities_with_nonzero_scores'] += int(np.count_nonzero(locality_scores > 0))
+            totals['walkability_score_sum'] += float(walkability_scores.sum())
+            totals['walkability_score_count'] += walkability_scores.size
+        
+        return stats
+
+    def generate_all_india_report(self, cities: List[str]):
         """Generate comprehensive All India summary report"""
         
+        # Stream each city's datasets into counters; only the merged counters are kept, never the rows
+        stats = defaultdict(Counter)
+        for city in cities:
+            try:
+                for key, counter in self.aggregate_city_report_stats(city).items():
+                    stats[key].update(counter)
+            except Exception as e:
+                logger.error(f"Failed to aggregate report data for {city}: {e}")
+        
+        hotels_by_city = stats['hotels_by_city']
+        localities_by_city = stats['localities_by_city']
+        reviews_by_prefix = stats['reviews_by_prefix']
+        landmarks_by_prefix = stats['landmarks_by_prefix']
+        totals = stats['totals']
+        
         # Calculate statistics
-        total_hotels = len(hotels)
-        total_reviews = len(reviews)
-        total_landmarks = len(landmarks)
-        total_localities = len(localities)
+        total_hotels = sum(hotels_by_city.values())
+        total_reviews = sum(reviews_by_prefix.values())
+        total_landmarks = sum(landmarks_by_prefix.values())
+        total_localities = sum(localities_by_city.values())
         
-        # City-wise breakdown
+        # City-wise breakdown; reviews and landmarks are keyed by each city's hotel_id prefix
+        prefixes = {city: city[:3].lower() for city in cities}
         city_breakdown = {}
         for city in cities:
-            city_hotels = [h for h in hotels if h.get('city') == city]
-            city_reviews = [r for r in reviews if r['hotel_id'].startswith(city.lower()[:3])]
-            city_landmarks = [l for l in landmarks if l['hotel_id'].startswith(city.lower()[:3])]
-            city_localities = [loc for loc in localities if loc.get('city') == city]
-            
+            prefix = prefixes[city]
             city_breakdown[city] = {
-                'hotels': len(city_hotels),
-                'reviews': len(city_reviews),
-                'landmarks': len(city_landmarks),
-                'localities': len(city_localities)
+                'hotels': hotels_by_city[city],
+                'reviews': reviews_by_prefix[prefix],
+                'landmarks': landmarks_by_prefix[prefix],
+                'localities': localities_by_city[city]
             }
         
-        # Overall statistics
-        avg_rating = 0
-        avg_locality_score = 0
-        avg_walkability_score = 0
+        hotels_with_ratings = totals['hotels_with_ratings']
+        hotels_with_phone = totals['hotels_with_phone']
+        hotels_with_website = totals['hotels_with_website']
+        localities_with_nonzero_scores = totals['localities_with_nonzero_scores']
+        avg_rating = round(totals['rating_sum'] / hotels_with_ratings, 2) if hotels_with_ratings else 0
+        avg_locality_score = (
+            round(totals['locality_score_sum'] / totals['locality_score_count'], 1)
+            if totals['locality_score_count'] else 0
+        )
+        avg_walkability_score = (
+            round(totals['walkability_score_sum'] / totals['walkability_score_count'], 1)
+            if totals['walkability_score_count'] else 0
+        )
         
-        if hotels:
-            ratings = [float(h.get('rating', 0)) for h in hotels if h.get('rating') and h.get('rating') != '']
-            avg_rating = round(sum(ratings) / len(ratings), 2) if ratings else 0
-        
-        if localities:
-            locality_scores = [float(loc.get('locality_score', 0)) for loc in localities if loc.get('locality_score')]
-            avg_locality_score = round(sum(locality_scores) / len(locality_scores), 1) if locality_scores else 0
-            
-            walkability_scores = [float(loc.get('walkability_score', 0)) for loc in localities if loc.get('walkability_score')]
-            avg_walkability_score = round(sum(walkability_scores) / len(walkability_scores), 1) if walkability_scores else 0
+        # Top cities by hotel count, shared by the report and the console summary
+        top_cities = heapq.nlargest(10, city_breakdown.items(), key=lambda x: x[1]['hotels'])
         
         # Create comprehensive report
         report = {
@@ -1918,43 +2385,33 @@ class HotelDataFetcher:
             },
             'city_breakdown': city_breakdown,
             'data_quality': {
-                'hotels_with_ratings': len([h for h in hotels if h.get('rating') and h.get('rating') != '']),
-                'hotels_with_phone': len([h for h in hotels if h.get('phone_number') and h.get('phone_number') != '']),
-                'hotels_with_website': len([h for h in hotels if h.get('website_uri') and h.get('website_uri') != '']),
-                'landmarks_with_travel_time': len([l for l in landmarks if l.get('travel_time_minutes') and l.get('travel_time_minutes') != '']),
-                'localities_with_nonzero_scores': len([loc for loc in localities if float(loc.get('locality_score', 0)) > 0])
+                'hotels_with_ratings': hotels_with_ratings,
+                'hotels_with_phone': hotels_with_phone,
+                'hotels_with_website': hotels_with_website,
+                'landmarks_with_travel_time': totals['landmarks_with_travel_time'],
+                'localities_with_nonzero_scores': localities_with_nonzero_scores
             },
-            'top_cities_by_hotel_count': sorted(city_breakdown.items(), 
-                                              key=lambda x: x[1]['hotels'], 
-                                              reverse=True)[:10],
+            'top_cities_by_hotel_count': top_cities,
             'api_usage_summary': dict(self.request_counts)
         }
         
         # Save All India report
-        reports_dir = self.OUTPUT_DIR / "All_India" / "reports"
-        reports_dir.mkdir(parents=True, exist_ok=True)
+        reports_dir = self._ensure_dir(self.OUTPUT_DIR / "All_India" / "reports")
         
         report_file = reports_dir / "all_india_summary_report.json"
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
-        
-        # Also create a summary CSV for easy analysis
-        summary_csv_data = []
-        for city, stats in city_breakdown.items():
-            summary_csv_data.append({
-                'city': city,
-                'hotels_count': stats['hotels'],
-                'reviews_count': stats['reviews'],
-                'landmarks_count': stats['landmarks'],
-                'localities_count': stats['localities']
-            })
+        # Encode in one go and write once instead of json.dump's many small chunks
+        report_file.write_text(json.dumps(report, indent=2))
         
+        # Also create a summary CSV for easy analysis, written straight from the breakdown as tuples
         summary_csv_file = reports_dir / "all_india_city_summary.csv"
-        if summary_csv_data:
+        if city_breakdown:
             with open(summary_csv_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=summary_csv_data[0].keys())
-                writer.writeheader()
-                writer.writerows(summary_csv_data)
+                writer = csv.writer(f)
+                writer.writerow(('city', 'hotels_count', 'reviews_count', 'landmarks_count', 'localities_count'))
+                writer.writerows(
+                    (city, stats['hotels'], stats['reviews'], stats['landmarks'], stats['localities'])
+                    for city, stats in city_breakdown.items()
+                )
         
         logger.info(f"Generated All India report: {report['summary']}")
         logger.info(f"All India report saved to {report_file}")
@@ -1972,26 +2429,49 @@ class HotelDataFetcher:
         print(f"Average Locality Score: {avg_locality_score}")
         print(f"Average Walkability Score: {avg_walkability_score}")
         print("\nTop 5 Cities by Hotel Count:")
-        for city, stats in sorted(city_breakdown.items(), key=lambda x: x[1]['hotels'], reverse=True)[:5]:
+        for city, stats in top_cities[:5]:
             print(f"  {city}: {stats['hotels']} hotels")
         print("="*60)
 
+# Fetcher owned by a run_all_cities worker process; it lives across cities so its request caps hold per process
+_worker_fetcher: Optional[HotelDataFetcher] = None
+
+def _init_city_worker(workers: int, dataset_format: str = 'csv'):
+    """Create the worker process's fetcher with its share of the API rates and request caps"""
+    global _worker_fetcher
+    _worker_fetcher = HotelDataFetcher()
+    _worker_fetcher.DATASET_FORMAT = dataset_format
+    _worker_fetcher.share_rate_limits(workers)
+
+def _process_city_worker(city_name: str, max_hotels: int) -> Dict[str, int]:
+    """Process a single city in a worker process and return the API usage it added"""
+    before = dict(_worker_fetcher.request_counts)
+    _worker_fetcher.process_city(city_name, max_hotels)
+    return {api_type: count - before[api_type] for api_type, count in _worker_fetcher.request_counts.items()}
+
 def main():
     parser = argparse.ArgumentParser(description="Hotel Data Fetching Script")
     parser.add_argument("--all", action="store_true", help="Process all cities")
     parser.add_argument("--city", type=str, help="Process specific city")
     parser.add_argument("--per-city", type=int, help="Number of hotels per city")
     parser.add_argument("--test", action="store_true", help="Run test mode")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes used with --all")
+    parser.add_argument("--format", choices=("csv", "parquet"),
+                        help="Dataset output format; parquet also writes Parquet copies of the CSVs (requires pyarrow)")
     
     args = parser.parse_args()
+    if args.format == 'parquet' and not PARQUET_AVAILABLE:
+        parser.error("--format parquet requires pyarrow")
     
     try:
         fetcher = HotelDataFetcher()
+        if args.format:
+            fetcher.DATASET_FORMAT = args.format
         
         if args.test:
             fetcher.run_test()
         elif args.all:
-            fetcher.run_all_cities()
+            fetcher.run_all_cities(workers=args.workers)
         elif args.city:
             per_city = args.per_city or fetcher.DEFAULT_PER_CITY
             fetcher.process_city(args.city, per_city)